@@ -1,27 +1,42 @@
+import argparse
+import os
+import runpy
 import sys
 from pathlib import Path
-import subprocess
+
+from graphs.build_cache import STAGES, default_build_cache
 
 
 def executar_script(script_path: Path, descricao: str):
+    # Roda no mesmo processo: o cache de graphs.io (CSV já lido e parseado) vale para todos os scripts
+    cwd_anterior = os.getcwd()
     try:
-        resultado = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=script_path.parent
-        )
-        
-        if resultado.returncode == 0:
+        os.chdir(script_path.parent)
+        runpy.run_path(str(script_path), run_name='__main__')
+        return True
+    except SystemExit as e:
+        if e.code in (None, 0):
             return True
-        else:
-            print(f"Falhou com código {resultado.returncode}")
-            return False
-            
+        print(f"Falhou com código {e.code}")
+        return False
     except Exception as e:
         print(f"Erro ao executar: {str(e)}")
         return False
+    finally:
+        os.chdir(cwd_anterior)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa o pipeline do projeto de grafos")
+    parser.add_argument('--force', nargs='*', choices=STAGES, metavar='ETAPA',
+                        help=f"regera os artefatos mesmo sem mudanças nas entradas; "
+                             f"sem ETAPA, regera todos ({', '.join(STAGES)})")
+    args = parser.parse_args(argv)
 
+    if args.force is not None:
+        default_build_cache.force_all = not args.force
+        default_build_cache.force = set(args.force)
 
-def main():
     base_path = Path(__file__).parent
     
     scripts = [
@@ -1,169 +1,1504 @@
 import heapq
-from collections import deque, defaultdict
-from typing import Dict, List, Tuple, Set
+import json
+import os
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Set, Union
 
+import numpy as np
 
-def bfs(graph: Dict[str, List[str]], start: str) -> Dict:
+from graphs.csr import CSRGraph, _to_array, as_csr
+
+Graph = Union[Dict[str, Dict[str, float]], Dict[str, List[str]], CSRGraph]
+
+INF = float('inf')
+
+DIAL_MAX_WEIGHT = 64
+
+
+def _bfs_layers_csr(g: CSRGraph, sources: List[int]) -> Iterator[List[int]]:
+    offsets, targets = g.offsets, g.targets
+
+    visited = bytearray(len(g.names))
+    frontier = []
+    for s in sources:
+        if not visited[s]:
+            visited[s] = 1
+            frontier.append(s)
+
+    while frontier:
+        yield frontier
+        next_frontier = []
+        for node in frontier:
+            for e in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[e]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+
+def bfs_layers(graph: Graph, sources: Iterable[str]) -> Iterator[List[str]]:
+    g = as_csr(graph)
+    names = g.names
+    source_ids = [g.index[name] for name in sources if name in graph]
+
+    for layer in _bfs_layers_csr(g, source_ids):
+        yield [names[v] for v in layer]
+
+
+def multi_source_bfs(graph: Graph, sources: Iterable[str]) -> Dict:
+    order = []
+    layers = {}
+    distances = {}
+
+    for depth, layer in enumerate(bfs_layers(graph, sources)):
+        layers[depth] = layer
+        order.extend(layer)
+        for name in layer:
+            distances[name] = depth
+
+    return {
+        'order': order,
+        'layers': layers,
+        'distances': distances
+    }
+
+
+def bfs(graph: Graph, start: str) -> Dict:
     if start not in graph:
         return {'order': [], 'layers': {}, 'distances': {}}
-    
-    visited = {start}
-    queue = deque([(start, 0)])
-    order = [start]
-    layers = defaultdict(list)
-    distances = {start: 0}
-    
-    layers[0].append(start)
-    
-    while queue:
-        node, layer = queue.popleft()
-        
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((neighbor, layer + 1))
-                order.append(neighbor)
-                layers[layer + 1].append(neighbor)
-                distances[neighbor] = layer + 1
-    
+
+    return multi_source_bfs(graph, [start])
+
+
+def _gather_edges(offsets: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), counts
+    # Índices das arestas de todos os vértices, concatenados na ordem de `vertices`
+    shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return shifts + np.arange(total, dtype=np.int64), counts
+
+
+def direction_optimizing_bfs(graph: Graph, start: str, alpha: float = 14.0, beta: float = 24.0) -> Dict:
+    if start not in graph:
+        return {'order': [], 'layers': {}, 'distances': {}}
+
+    g = as_csr(graph)
+    names = g.names
+    n = len(names)
+    offsets, targets, _ = g.as_numpy()
+    rev_offsets, rev_targets = None, None
+    out_degree = np.diff(offsets)
+
+    visited = np.zeros(n, dtype=bool)
+    frontier = np.array([g.index[start]], dtype=np.int64)
+    visited[frontier] = True
+    unexplored_edges = int(out_degree.sum()) - int(out_degree[frontier].sum())
+    bottom_up = False
+    layers = []
+
+    while frontier.size:
+        layers.append(frontier)
+        frontier_edges = int(out_degree[frontier].sum())
+
+        # Heurística de Beamer: de cima para baixo enquanto a fronteira é pequena
+        if not bottom_up and frontier_edges * alpha > unexplored_edges:
+            bottom_up = True
+        elif bottom_up and frontier.size * beta < n:
+            bottom_up = False
+
+        if bottom_up:
+            if rev_offsets is None:
+                rev_offsets, rev_targets, _ = g.reverse().as_numpy()
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            candidates = np.flatnonzero(~visited)
+            edges, counts = _gather_edges(rev_offsets, candidates)
+            owners = np.repeat(candidates, counts)[in_frontier[rev_targets[edges]]]
+            # owners já vem ordenado, então basta descartar repetições consecutivas
+            if owners.size:
+                owners = owners[np.concatenate(([True], owners[1:] != owners[:-1]))]
+            frontier = owners.astype(np.int64)
+        else:
+            edges, _ = _gather_edges(offsets, frontier)
+            neighbors = targets[edges]
+            neighbors = neighbors[~visited[neighbors]]
+            _, first = np.unique(neighbors, return_index=True)
+            frontier = neighbors[np.sort(first)].astype(np.int64)
+
+        visited[frontier] = True
+        unexplored_edges -= int(out_degree[frontier].sum())
+
+    order = []
+    result_layers = {}
+    distances = {}
+    for depth, layer in enumerate(layers):
+        layer_names = [names[v] for v in layer.tolist()]
+        result_layers[depth] = layer_names
+        order.extend(layer_names)
+        distances.update(dict.fromkeys(layer_names, depth))
+
     return {
         'order': order,
-        'layers': dict(layers),
+        'layers': result_layers,
         'distances': distances
     }
 
 
-def dfs(graph: Dict[str, List[str]], start: str) -> Dict:
+def dfs(graph: Graph, start: str) -> Dict:
     if start not in graph:
-        return {'order': [], 'has_cycle': False}
-    
-    visited = set()
+        return {'order': [], 'has_cycle': False, 'discovery': {}, 'finish': {}}
+
+    g = as_csr(graph)
+    offsets, targets, names = g.offsets, g.targets, g.names
+    n = len(names)
+
+    visited = bytearray(n)
+    in_stack = bytearray(n)
     order = []
-    has_cycle = [False]
-    in_stack = set()
-    
-    def dfs_visit(node):
-        visited.add(node)
-        in_stack.add(node)
-        order.append(node)
-        
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                dfs_visit(neighbor)
-            elif neighbor in in_stack:
-                has_cycle[0] = True
-        
-        in_stack.remove(node)
-    
-    dfs_visit(start)
-    
+    discovery = {}
+    finish = {}
+    has_cycle = False
+    time = 0
+
+    # Pilha explícita de (vértice, próxima aresta a examinar) no lugar da recursão
+    s = g.index[start]
+    visited[s] = in_stack[s] = 1
+    order.append(start)
+    discovery[start] = time
+    time += 1
+    stack = [(s, offsets[s])]
+
+    while stack:
+        node, e = stack[-1]
+        end = offsets[node + 1]
+
+        while e < end:
+            neighbor = targets[e]
+            e += 1
+            if not visited[neighbor]:
+                stack[-1] = (node, e)
+                visited[neighbor] = in_stack[neighbor] = 1
+                name = names[neighbor]
+                order.append(name)
+                discovery[name] = time
+                time += 1
+                stack.append((neighbor, offsets[neighbor]))
+                break
+            elif in_stack[neighbor]:
+                has_cycle = True
+        else:
+            stack.pop()
+            in_stack[node] = 0
+            finish[names[node]] = time
+            time += 1
+
     return {
         'order': order,
-        'has_cycle': has_cycle[0]
+        'has_cycle': has_cycle,
+        'discovery': discovery,
+        'finish': finish
     }
 
 
-def dijkstra(graph: Dict[str, Dict[str, float]], start: str, end: str = None) -> Dict:
-    if start not in graph:
-        return {'distances': {}, 'path_to_end': None, 'cost': float('inf')}
-    
-    distances = {start: 0.0}
-    parents = {start: None}
-    pq = [(0.0, start)]
-    visited = set()
-    
+def _tarjan_scc_csr(g: CSRGraph) -> Tuple[List[int], int]:
+    offsets, targets = g.offsets, g.targets
+    n = len(g.names)
+
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    component = [-1] * n
+    counter = 0
+    num_components = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+
+        while work:
+            node, e = work[-1]
+            end = offsets[node + 1]
+
+            while e < end:
+                neighbor = targets[e]
+                e += 1
+                if index[neighbor] == -1:
+                    work[-1] = (node, e)
+                    index[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = 1
+                    work.append((neighbor, offsets[neighbor]))
+                    break
+                elif on_stack[neighbor] and index[neighbor] < low[node]:
+                    low[node] = index[neighbor]
+            else:
+                work.pop()
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component[member] = num_components
+                        if member == node:
+                            break
+                    num_components += 1
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+    # Tarjan fecha primeiro os componentes sumidouro; invertendo, a numeração fica topológica
+    last = num_components - 1
+    return [last - c for c in component], num_components
+
+
+def strongly_connected_components(graph: Graph) -> List[List[str]]:
+    g = as_csr(graph)
+    component, num_components = _tarjan_scc_csr(g)
+
+    components = [[] for _ in range(num_components)]
+    for v, c in enumerate(component):
+        components[c].append(g.names[v])
+    return components
+
+
+def condensation(graph: Graph) -> Dict:
+    g = as_csr(graph)
+    offsets, targets, names = g.offsets, g.targets, g.names
+    component, num_components = _tarjan_scc_csr(g)
+
+    components = [[] for _ in range(num_components)]
+    dag = [set() for _ in range(num_components)]
+    for v, c in enumerate(component):
+        components[c].append(names[v])
+        for e in range(offsets[v], offsets[v + 1]):
+            d = component[targets[e]]
+            if d != c:
+                dag[c].add(d)
+
+    return {
+        'components': components,
+        'component_of': {names[v]: c for v, c in enumerate(component)},
+        'dag': {c: sorted(successors) for c, successors in enumerate(dag)}
+    }
+
+
+class ReachabilityIndex:
+    """Alcançabilidade em O(1) sobre a condensação: uma linha de bits por componente.
+
+    A memória é de k * k / 8 bytes para k componentes fortemente conexos.
+    """
+
+    def __init__(self, graph: Graph):
+        result = condensation(graph)
+        self.components = result['components']
+        self.component_of = result['component_of']
+        self.dag = result['dag']
+
+        k = len(self.components)
+        bits = np.zeros((k, (k + 7) // 8), dtype=np.uint8)
+        # Componentes em ordem topológica: os sucessores de c têm índice maior e já estão prontos
+        for c in range(k - 1, -1, -1):
+            bits[c, c >> 3] |= 1 << (c & 7)
+            for d in self.dag[c]:
+                bits[c] |= bits[d]
+        self.bits = bits
+
+    def reachable(self, start: str, end: str) -> bool:
+        c = self.component_of.get(start)
+        d = self.component_of.get(end)
+        if c is None or d is None:
+            return False
+        return bool(self.bits[c, d >> 3] >> (d & 7) & 1)
+
+    def reachable_components(self, start: str) -> List[int]:
+        c = self.component_of[start]
+        return np.flatnonzero(np.unpackbits(self.bits[c], bitorder='little')[:len(self.components)]).tolist()
+
+
+class _SparseState(dict):
+    """Estado por vértice guardado só para os vértices tocados; os demais valem ``default``."""
+
+    __slots__ = ('default',)
+
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+def _search_state(n: int, bounded: bool):
+    # Consultas limitadas (destino, alvos, max_cost ou max_settled) costumam tocar uma região
+    # pequena: com dicts esparsos o custo acompanha essa região em vez de alocar O(V)
+    if bounded:
+        return _SparseState(INF), _SparseState(-1), _SparseState(0)
+    return [INF] * n, [-1] * n, bytearray(n)
+
+
+def _dense_state(n: int, distances: Dict, parents: Dict, visited: Dict):
+    # A região cresceu demais para os dicts compensarem: passa para arrays densos
+    dense = [INF] * n, [-1] * n, bytearray(n)
+    for state, values in zip(dense, (distances, parents, visited)):
+        for v, value in values.items():
+            state[v] = value
+    return dense
+
+
+def _dijkstra_csr(g: CSRGraph, s: int, t: int = None, max_cost: float = INF,
+                  max_settled: int = None, stop_at: Set[int] = None) -> Tuple[List[float], List[int], List[int]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    n = len(g.names)
+
+    bounded = t is not None or bool(stop_at) or max_settled is not None or max_cost < INF
+    distances, parents, visited = _search_state(n, bounded)
+    sparse_limit = n >> 4 if bounded else INF
+    reached = [s]
+    distances[s] = 0.0
+    pq = [(0.0, s)]
+    remaining = len(stop_at) if stop_at else 0
+    settled = 0
+
     while pq:
         current_dist, current = heapq.heappop(pq)
-        
-        if current in visited:
+
+        if visited[current]:
             continue
-        
-        visited.add(current)
-        
-        if end and current == end:
+
+        visited[current] = 1
+
+        if current == t:
+            break
+
+        if remaining and current in stop_at:
+            remaining -= 1
+            if not remaining:
+                break
+
+        settled += 1
+        if max_settled is not None and settled >= max_settled:
             break
-        
-        if current_dist > distances.get(current, float('inf')):
+
+        if len(reached) > sparse_limit:
+            distances, parents, visited = _dense_state(n, distances, parents, visited)
+            sparse_limit = INF
+
+        if current_dist > distances[current]:
             continue
-        
-        for neighbor, weight in graph.get(current, {}).items():
-            distance = current_dist + weight
-            
-            if distance < distances.get(neighbor, float('inf')):
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            distance = current_dist + weights[e]
+
+            if distance < distances[neighbor] and distance <= max_cost:
+                if distances[neighbor] == INF:
+                    reached.append(neighbor)
                 distances[neighbor] = distance
                 parents[neighbor] = current
                 heapq.heappush(pq, (distance, neighbor))
-    
+
+    return distances, parents, reached
+
+
+def _dial_csr(g: CSRGraph, s: int, t: int = None, max_cost: float = INF,
+              max_settled: int = None, stop_at: Set[int] = None,
+              max_weight: int = None) -> Tuple[List[float], List[int], List[int]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    n = len(g.names)
+    if max_weight is None:
+        max_weight = g.max_integer_weight()
+
+    # Fila circular de baldes: com pesos <= C, só C + 1 distâncias estão abertas ao mesmo tempo
+    num_buckets = max_weight + 1
+    buckets = [[] for _ in range(num_buckets)]
+
+    bounded = t is not None or bool(stop_at) or max_settled is not None or max_cost < INF
+    distances, parents, visited = _search_state(n, bounded)
+    sparse_limit = n >> 4 if bounded else INF
+    reached = [s]
+    distances[s] = 0.0
+    buckets[0].append(s)
+    pending = 1
+    current_dist = 0
+    remaining = len(stop_at) if stop_at else 0
+    settled = 0
+
+    while pending:
+        bucket = buckets[current_dist % num_buckets]
+
+        while bucket:
+            current = bucket.pop()
+            pending -= 1
+
+            if visited[current] or distances[current] != current_dist:
+                continue
+
+            visited[current] = 1
+
+            if current == t:
+                return distances, parents, reached
+
+            if remaining and current in stop_at:
+                remaining -= 1
+                if not remaining:
+                    return distances, parents, reached
+
+            settled += 1
+            if max_settled is not None and settled >= max_settled:
+                return distances, parents, reached
+
+            if len(reached) > sparse_limit:
+                distances, parents, visited = _dense_state(n, distances, parents, visited)
+                sparse_limit = INF
+
+            for e in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[e]
+                distance = current_dist + weights[e]
+
+                if distance < distances[neighbor] and distance <= max_cost:
+                    if distances[neighbor] == INF:
+                        reached.append(neighbor)
+                    distances[neighbor] = distance
+                    parents[neighbor] = current
+                    buckets[int(distance) % num_buckets].append(neighbor)
+                    pending += 1
+
+        current_dist += 1
+
+    return distances, parents, reached
+
+
+def _shortest_paths_csr(g: CSRGraph, s: int, t: int = None, max_cost: float = INF,
+                        max_settled: int = None, stop_at: Set[int] = None) -> Tuple[List[float], List[int], List[int]]:
+    max_weight = g.max_integer_weight()
+    if max_weight is not None and max_weight <= DIAL_MAX_WEIGHT:
+        return _dial_csr(g, s, t, max_cost, max_settled, stop_at, max_weight)
+    return _dijkstra_csr(g, s, t, max_cost, max_settled, stop_at)
+
+
+def _build_path(parents: List[int], s: int, t: int) -> List[int]:
+    path = []
+    node = t
+    while node != -1:
+        path.append(node)
+        if node == s:
+            break
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def _path_result(g: CSRGraph, s: int, t: int, distances, parents, reached: Iterable[int]) -> Dict:
+    """Monta ``{'distances', 'path_to_end', 'cost'}`` a partir dos arrays de distâncias e pais."""
+    names = g.names
     result = {
-        'distances': distances,
+        'distances': {names[v]: distances[v] for v in reached},
         'path_to_end': None,
-        'cost': float('inf')
+        'cost': INF
     }
 
-    if end and end in parents:
-        path = []
-        node = end
-        while node is not None:
-            path.append(node)
-            node = parents[node]
-        path.reverse()
-        result['path_to_end'] = path
-        result['cost'] = distances[end]
-    
+    if t is not None and distances[t] < INF:
+        result['path_to_end'] = [names[v] for v in _build_path(parents, s, t)]
+        result['cost'] = distances[t]
+
     return result
 
 
-def bellman_ford(graph: Dict[str, Dict[str, float]], start: str, 
+def dijkstra(graph: Graph, start: str, end: str = None, max_cost: float = None,
+             max_settled: int = None, targets: Iterable[str] = None) -> Dict:
+    if max_settled is not None and max_settled < 1:
+        raise ValueError("max_settled deve ser pelo menos 1")
+
+    if start not in graph:
+        return {'distances': {}, 'path_to_end': None, 'cost': INF}
+
+    g = as_csr(graph)
+    s = g.index[start]
+    t = g.index.get(end) if end is not None else None
+
+    stop_at = None
+    if targets is not None:
+        stop_at = {g.index[name] for name in targets if name in g.index}
+        if t is not None:
+            stop_at.add(t)
+        if not stop_at:
+            stop_at = {s}
+
+    distances, parents, reached = _shortest_paths_csr(
+        g, s, t if stop_at is None else None,
+        INF if max_cost is None else max_cost, max_settled, stop_at)
+
+    return _path_result(g, s, t, distances, parents, reached)
+
+
+def _bidirectional_dijkstra_csr(g: CSRGraph, s: int, t: int) -> Tuple[float, List[int], List[float], List[int]]:
+    rev = g.reverse()
+    n = len(g.names)
+    sides = ((g.offsets, g.targets, g.weights), (rev.offsets, rev.targets, rev.weights))
+    # Consulta ponto a ponto: cada lado começa esparso e só vira array denso se passar de n/16
+    forward, backward = _search_state(n, True), _search_state(n, True)
+    distances, parents, settled = ([forward[i], backward[i]] for i in range(3))
+    sparse_limit = [n >> 4, n >> 4]
+    touched = [1, 1]
+    reached = [s]
+    pqs = ([(0.0, s)], [(0.0, t)])
+    distances[0][s] = 0.0
+    distances[1][t] = 0.0
+
+    best = 0.0 if s == t else INF
+    meet = s if s == t else -1
+
+    while pqs[0] and pqs[1]:
+        top_forward, top_backward = pqs[0][0][0], pqs[1][0][0]
+        if top_forward + top_backward >= best:
+            break
+
+        side = 0 if top_forward <= top_backward else 1
+        current_dist, current = heapq.heappop(pqs[side])
+
+        if settled[side][current]:
+            continue
+        settled[side][current] = 1
+
+        if touched[side] > sparse_limit[side]:
+            distances[side], parents[side], settled[side] = _dense_state(
+                n, distances[side], parents[side], settled[side])
+            sparse_limit[side] = INF
+
+        offsets, targets, weights = sides[side]
+        dist_side, dist_other = distances[side], distances[1 - side]
+        parents_side = parents[side]
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            distance = current_dist + weights[e]
+
+            if distance < dist_side[neighbor]:
+                if dist_side[neighbor] == INF:
+                    touched[side] += 1
+                    if side == 0:
+                        reached.append(neighbor)
+                dist_side[neighbor] = distance
+                parents_side[neighbor] = current
+                heapq.heappush(pqs[side], (distance, neighbor))
+
+                if distance + dist_other[neighbor] < best:
+                    best = distance + dist_other[neighbor]
+                    meet = neighbor
+
+    if meet == -1:
+        return INF, [], distances[0], reached
+
+    path = _build_path(parents[0], s, meet)
+    node = parents[1][meet]
+    while node != -1:
+        path.append(node)
+        if node == t:
+            break
+        node = parents[1][node]
+
+    return best, path, distances[0], reached
+
+
+def dial(graph: Graph, start: str, end: str = None) -> Dict:
+    if start not in graph:
+        return {'distances': {}, 'path_to_end': None, 'cost': INF}
+
+    g = as_csr(graph)
+    if g.max_integer_weight() is None:
+        raise ValueError("dial exige pesos inteiros não negativos")
+
+    s = g.index[start]
+    t = g.index.get(end) if end is not None else None
+
+    distances, parents, reached = _dial_csr(g, s, t)
+
+    return _path_result(g, s, t, distances, parents, reached)
+
+
+def bidirectional_dijkstra(graph: Graph, start: str, end: str = None) -> Dict:
+    if start not in graph or end is None or end not in graph:
+        return dijkstra(graph, start, end)
+
+    g = as_csr(graph)
+    names = g.names
+
+    cost, path, distances, reached = _bidirectional_dijkstra_csr(g, g.index[start], g.index[end])
+
+    return {
+        'distances': {names[v]: distances[v] for v in reached},
+        'path_to_end': [names[v] for v in path] if path else None,
+        'cost': cost
+    }
+
+
+def _astar_csr(g: CSRGraph, s: int, t: int,
+               heuristic: Callable[[int], float]) -> Tuple[List[float], List[int], List[int]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    n = len(g.names)
+
+    # Consulta ponto a ponto: estado esparso até a busca tocar n/16 vértices
+    distances, parents, _ = _search_state(n, True)
+    sparse_limit = n >> 4
+    estimates = {s: heuristic(s)}
+    reached = [s]
+    distances[s] = 0.0
+    pq = [(estimates[s], 0.0, s)]
+
+    # Sem conjunto fechado: um vértice é reaberto se achar caminho melhor,
+    # o que mantém o resultado ótimo mesmo com heurística só admissível
+    while pq:
+        _, current_dist, current = heapq.heappop(pq)
+
+        if current_dist > distances[current]:
+            continue
+
+        if current == t:
+            break
+
+        if len(reached) > sparse_limit:
+            distances, parents, _ = _dense_state(n, distances, parents, {})
+            sparse_limit = INF
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            distance = current_dist + weights[e]
+
+            if distance < distances[neighbor]:
+                if distances[neighbor] == INF:
+                    reached.append(neighbor)
+                    estimates[neighbor] = heuristic(neighbor)
+                distances[neighbor] = distance
+                parents[neighbor] = current
+                heapq.heappush(pq, (distance + estimates[neighbor], distance, neighbor))
+
+    return distances, parents, reached
+
+
+def astar(graph: Graph, start: str, end: str,
+          heuristic: Callable[[str, str], float] = None) -> Dict:
+    if start not in graph or end not in graph:
+        return dijkstra(graph, start, end)
+
+    if heuristic is None:
+        return dijkstra(graph, start, end)
+
+    g = as_csr(graph)
+    names = g.names
+    s, t = g.index[start], g.index[end]
+
+    distances, parents, reached = _astar_csr(g, s, t, lambda v: heuristic(names[v], end))
+
+    return _path_result(g, s, t, distances, parents, reached)
+
+
+def _spur_path_csr(g: CSRGraph, s: int, t: int, to_target: List[float], blocked_nodes: Set[int],
+                   blocked_edges: Set[Tuple[int, int]]) -> Tuple[List[int], List[float]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+
+    # A distância real até t no grafo completo é limite inferior consistente no grafo com bloqueios
+    distances = {s: 0.0}
+    parents = {s: -1}
+    pq = [(to_target[s], 0.0, s)]
+
+    while pq:
+        _, current_dist, current = heapq.heappop(pq)
+
+        if current_dist > distances[current]:
+            continue
+
+        if current == t:
+            path = []
+            node = t
+            while node != -1:
+                path.append(node)
+                node = parents[node]
+            path.reverse()
+            return path, [distances[v] for v in path]
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            if neighbor in blocked_nodes or to_target[neighbor] == INF or (current, neighbor) in blocked_edges:
+                continue
+            distance = current_dist + weights[e]
+
+            if distance < distances.get(neighbor, INF):
+                distances[neighbor] = distance
+                parents[neighbor] = current
+                heapq.heappush(pq, (distance + to_target[neighbor], distance, neighbor))
+
+    return None, None
+
+
+def k_shortest_paths(graph: Graph, start: str, end: str, k: int = None) -> Iterator[Dict]:
+    if start not in graph or end not in graph or (k is not None and k < 1):
+        return
+
+    g = as_csr(graph)
+    names = g.names
+    s, t = g.index[start], g.index[end]
+    to_target = _shortest_paths_csr(g.reverse(), t)[0]
+    if to_target[s] == INF:
+        return
+
+    path, prefix = _spur_path_csr(g, s, t, to_target, set(), set())
+    # Cada caminho aceito guarda (vértices, custos acumulados, índice do desvio em relação ao pai)
+    accepted = [(path, prefix, 0)]
+    candidates = []
+    seen = {tuple(path)}
+    counter = 0
+
+    while True:
+        path, prefix, deviation = accepted[-1]
+        yield {'path_to_end': [names[v] for v in path], 'cost': prefix[-1]}
+        if k is not None and len(accepted) >= k:
+            return
+
+        # Desvios antes de ``deviation`` já foram gerados quando o pai deste caminho foi aceito
+        for i in range(deviation, len(path) - 1):
+            root = path[:i + 1]
+            blocked_edges = {(other[i], other[i + 1]) for other, _, _ in accepted
+                             if len(other) > i + 1 and other[:i + 1] == root}
+            spur, spur_prefix = _spur_path_csr(g, path[i], t, to_target, set(root[:-1]), blocked_edges)
+            if spur is None:
+                continue
+
+            candidate = root[:-1] + spur
+            key = tuple(candidate)
+            if key in seen:
+                continue
+            seen.add(key)
+            candidate_prefix = prefix[:i] + [prefix[i] + d for d in spur_prefix]
+            counter += 1
+            heapq.heappush(candidates, (candidate_prefix[-1], len(candidate), counter,
+                                        candidate, candidate_prefix, i))
+
+        if not candidates:
+            return
+        _, _, _, path, prefix, deviation = heapq.heappop(candidates)
+        accepted.append((path, prefix, deviation))
+
+
+def _negative_cycle_from(parents: List[int], node: int) -> List[int]:
+    visited = set()
+    while node not in visited and node != -1:
+        visited.add(node)
+        node = parents[node]
+
+    if node == -1:
+        return None
+
+    cycle = [node]
+    current = parents[node]
+    while current != node and current != -1:
+        cycle.append(current)
+        current = parents[current]
+    cycle.reverse()
+    return cycle
+
+
+def bellman_ford(graph: Graph, start: str,
                   all_nodes: Set[str]) -> Dict:
     if start not in all_nodes:
         return {'distances': {}, 'has_negative_cycle': False, 'negative_cycle': None}
-    
-    distances = {node: float('inf') for node in all_nodes}
-    distances[start] = 0.0
-    parents = {node: None for node in all_nodes}
-    
-    for _ in range(len(all_nodes) - 1):
-        for node in graph:
-            if distances[node] == float('inf'):
+
+    g = as_csr(graph, all_nodes)
+    offsets, targets, weights, names = g.offsets, g.targets, g.weights, g.names
+    n = len(names)
+
+    distances = [INF] * n
+    distances[g.index[start]] = 0.0
+    parents = [-1] * n
+
+    for _ in range(n - 1):
+        changed = False
+        for node in range(n):
+            if distances[node] == INF:
                 continue
-            
-            for neighbor, weight in graph.get(node, {}).items():
-                if distances[node] + weight < distances[neighbor]:
-                    distances[neighbor] = distances[node] + weight
+
+            for e in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[e]
+                if distances[node] + weights[e] < distances[neighbor]:
+                    distances[neighbor] = distances[node] + weights[e]
                     parents[neighbor] = node
-    
+                    changed = True
+
+        if not changed:
+            break
+
     has_negative_cycle = False
     negative_cycle = None
-    
-    for node in graph:
-        if distances[node] == float('inf'):
+
+    for node in range(n):
+        if distances[node] == INF:
             continue
-        
-        for neighbor, weight in graph.get(node, {}).items():
-            if distances[node] + weight < distances[neighbor]:
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            if distances[node] + weights[e] < distances[neighbor]:
                 has_negative_cycle = True
-                
-                cycle_node = neighbor
-                visited = set()
-                while cycle_node not in visited and cycle_node is not None:
-                    visited.add(cycle_node)
-                    cycle_node = parents.get(cycle_node)
-                
-                if cycle_node:
-                    cycle = [cycle_node]
-                    current = parents[cycle_node]
-                    while current != cycle_node and current is not None:
-                        cycle.append(current)
-                        current = parents.get(current)
-                    cycle.reverse()
-                    negative_cycle = cycle
+                cycle = _negative_cycle_from(parents, neighbor)
+                if cycle:
+                    negative_cycle = [names[v] for v in cycle]
                 break
-        
+
         if has_negative_cycle:
             break
-    
+
     return {
-        'distances': distances,
+        'distances': {names[v]: distances[v] for v in range(n)},
+        'parents': {names[v]: names[parents[v]] if parents[v] != -1 else None for v in range(n)},
         'has_negative_cycle': has_negative_cycle,
         'negative_cycle': negative_cycle
     }
+
+
+def _parent_graph_cycle(parents: List[int], start: int) -> List[int]:
+    cycle = _negative_cycle_from(parents, start)
+    if cycle:
+        return cycle
+
+    state = bytearray(len(parents))
+    for node in range(len(parents)):
+        path = []
+        while node != -1 and not state[node]:
+            state[node] = 1
+            path.append(node)
+            node = parents[node]
+        if node != -1 and state[node] == 1:
+            return _negative_cycle_from(parents, node)
+        for v in path:
+            state[v] = 2
+    return None
+
+
+def _spfa_csr(g: CSRGraph, sources: List[int]) -> Tuple[List[float], List[int], List[int]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    n = len(g.names)
+
+    distances = [INF] * n
+    parents = [-1] * n
+    lengths = [0] * n
+    in_queue = bytearray(n)
+    for source in sources:
+        distances[source] = 0.0
+        in_queue[source] = 1
+    queue = deque(sources)
+
+    while queue:
+        node = queue.popleft()
+        in_queue[node] = 0
+        dist_node = distances[node]
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            distance = dist_node + weights[e]
+
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                parents[neighbor] = node
+                lengths[neighbor] = lengths[node] + 1
+
+                # Um caminho mínimo simples tem no máximo n - 1 arestas
+                if lengths[neighbor] >= n:
+                    return distances, parents, _parent_graph_cycle(parents, neighbor) or []
+
+                if not in_queue[neighbor]:
+                    in_queue[neighbor] = 1
+                    queue.append(neighbor)
+
+    return distances, parents, None
+
+
+def spfa(graph: Graph, start: str, all_nodes: Set[str]) -> Dict:
+    if start not in all_nodes:
+        return {'distances': {}, 'has_negative_cycle': False, 'negative_cycle': None}
+
+    g = as_csr(graph, all_nodes)
+    names = g.names
+    n = len(names)
+
+    distances, parents, cycle = _spfa_csr(g, [g.index[start]])
+
+    return {
+        'distances': {names[v]: distances[v] for v in range(n)},
+        'parents': {names[v]: names[parents[v]] if parents[v] != -1 else None for v in range(n)},
+        'has_negative_cycle': cycle is not None,
+        'negative_cycle': [names[v] for v in cycle] if cycle else None
+    }
+
+
+def _find_negative_cycle_csr(g: CSRGraph, removed: Set[int] = frozenset()) -> Tuple[List[int], List[int]]:
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    n = len(g.names)
+
+    # Super-fonte virtual: todos começam com distância 0, então nenhum ciclo fica fora do alcance
+    distances = [0.0] * n
+    parents = [-1] * n
+    parent_edge = [-1] * n
+    children = [set() for _ in range(n)]
+    active = bytearray(b'\x01') * n
+    in_queue = bytearray(b'\x01') * n
+    queue = deque(range(n))
+
+    while queue:
+        node = queue.popleft()
+        in_queue[node] = 0
+        if not active[node]:
+            continue
+        dist_node = distances[node]
+
+        for e in range(offsets[node], offsets[node + 1]):
+            if e in removed:
+                continue
+            neighbor = targets[e]
+            distance = dist_node + weights[e]
+            if distance >= distances[neighbor]:
+                continue
+            if neighbor == node:
+                return [node], [e]
+
+            # Desmonta a subárvore de neighbor; se node estiver nela, a aresta fecha um ciclo negativo
+            # sem esperar a n-ésima passada
+            subtree = []
+            stack = list(children[neighbor])
+            while stack:
+                x = stack.pop()
+                if x == node:
+                    cycle = [node]
+                    while cycle[-1] != neighbor:
+                        cycle.append(parents[cycle[-1]])
+                    cycle.reverse()
+                    return cycle, [parent_edge[v] for v in cycle[1:]] + [e]
+                subtree.append(x)
+                stack.extend(children[x])
+
+            children[neighbor].clear()
+            for x in subtree:
+                active[x] = 0
+                parents[x] = -1
+                children[x].clear()
+
+            if parents[neighbor] != -1:
+                children[parents[neighbor]].discard(neighbor)
+            distances[neighbor] = distance
+            parents[neighbor] = node
+            parent_edge[neighbor] = e
+            children[node].add(neighbor)
+            active[neighbor] = 1
+            if not in_queue[neighbor]:
+                in_queue[neighbor] = 1
+                queue.append(neighbor)
+
+    return None, None
+
+
+def find_negative_cycle(graph: Graph) -> List[str]:
+    g = as_csr(graph)
+    cycle, _ = _find_negative_cycle_csr(g)
+    return [g.names[v] for v in cycle] if cycle else None
+
+
+def negative_cycle_cover(graph: Graph) -> Dict:
+    """Cobertura de ciclos negativos do grafo inteiro, por cancelamento de ciclos.
+
+    ``cycles`` traz os ciclos negativos achados ao longo do cancelamento, não todos os ciclos
+    negativos do grafo (que podem ser exponencialmente muitos); remover ``cancelled_edges``
+    basta para o grafo ficar sem ciclo negativo.
+    """
+    g = as_csr(graph)
+    targets, weights, names = g.targets, g.weights, g.names
+    removed: Set[int] = set()
+    cycles = []
+    cancelled = []
+
+    # Cada ciclo achado perde sua aresta mais negativa e a busca recomeça
+    while True:
+        cycle, edges = _find_negative_cycle_csr(g, removed)
+        if cycle is None:
+            break
+
+        worst = min(edges, key=lambda e: weights[e])
+        removed.add(worst)
+
+        cycles.append({
+            'cycle': [names[v] for v in cycle],
+            'weight': sum(weights[e] for e in edges)
+        })
+        cancelled.append((names[cycle[edges.index(worst)]], names[targets[worst]]))
+
+    return {
+        'has_negative_cycle': bool(cycles),
+        'cycles': cycles,
+        'cancelled_edges': cancelled
+    }
+
+
+class JohnsonDistances(Mapping):
+    """Linhas da matriz de distâncias do Johnson, calculadas sob demanda e guardadas."""
+
+    def __init__(self, graph: CSRGraph, potentials: List[float]):
+        self._graph = graph
+        self._potentials = potentials
+        self._rows: Dict[str, Dict[str, float]] = {}
+
+    def __getitem__(self, source: str) -> Dict[str, float]:
+        if source not in self._rows:
+            g, h = self._graph, self._potentials
+            names = g.names
+            u = g.index[source]
+            distances, _, reached = _dijkstra_csr(g, u)
+            self._rows[source] = {names[v]: distances[v] - h[u] + h[v] for v in reached}
+        return self._rows[source]
+
+    def __iter__(self):
+        return iter(self._graph.names)
+
+    def __len__(self) -> int:
+        return len(self._graph.names)
+
+
+def johnson(graph: Graph, all_nodes: Set[str] = (), lazy: bool = False) -> Dict:
+    g = as_csr(graph, all_nodes)
+    names = g.names
+    n = len(names)
+
+    # Bellman-Ford a partir de uma super-origem virtual ligada a todos com peso 0
+    potentials, _, cycle = _spfa_csr(g, list(range(n)))
+
+    if cycle is not None:
+        return {
+            'distances': {},
+            'potentials': {},
+            'has_negative_cycle': True,
+            'negative_cycle': [names[v] for v in cycle] if cycle else None
+        }
+
+    offsets, targets, weights = g.offsets, g.targets, g.weights
+    reweighted = array('d', weights)
+    for u in range(n):
+        for e in range(offsets[u], offsets[u + 1]):
+            reweighted[e] = max(0.0, weights[e] + potentials[u] - potentials[targets[e]])
+
+    rows = JohnsonDistances(CSRGraph(names, offsets, targets, reweighted), potentials)
+    distances = rows if lazy else {name: rows[name] for name in names}
+
+    return {
+        'distances': distances,
+        'potentials': {names[v]: potentials[v] for v in range(n)},
+        'has_negative_cycle': False,
+        'negative_cycle': None
+    }
+
+
+_worker_graph: CSRGraph = None
+
+
+def _init_distance_worker(graph: CSRGraph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _distance_rows(sources: List[int], targets: List[int], graph: CSRGraph = None) -> np.ndarray:
+    g = graph if graph is not None else _worker_graph
+    rows = np.empty((len(sources), len(targets)), dtype=np.float64)
+    for i, s in enumerate(sources):
+        distances = _shortest_paths_csr(g, s)[0]
+        rows[i] = [distances[t] for t in targets]
+    return rows
+
+
+def distance_matrix(graph: Graph, sources: Iterable[str], targets: Iterable[str] = None,
+                    workers: int = 1) -> np.ndarray:
+    g = as_csr(graph)
+    source_ids = [g.index[name] for name in sources]
+    target_ids = [g.index[name] for name in targets] if targets is not None else list(range(len(g)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(source_ids)))
+
+    if workers == 1:
+        return _distance_rows(source_ids, target_ids, g)
+
+    # O grafo vai para cada processo uma única vez, pelo initializer; as tarefas levam só ids
+    num_chunks = workers * 4
+    size = -(-len(source_ids) // num_chunks)
+    chunks = [source_ids[i:i + size] for i in range(0, len(source_ids), size)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_distance_worker,
+                             initargs=(g,)) as pool:
+        blocks = list(pool.map(_distance_rows, chunks, [target_ids] * len(chunks)))
+
+    return np.vstack(blocks)
+
+
+def floyd_warshall(graph: Graph) -> Dict:
+    g = as_csr(graph)
+    n = len(g.names)
+    offsets, targets, weights = g.as_numpy()
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+
+    distances = np.full((n, n), INF)
+    np.fill_diagonal(distances, 0.0)
+    np.minimum.at(distances, (sources, targets), weights)
+
+    # next_hop[i, j] é o primeiro vértice depois de i no caminho mínimo até j
+    next_hop = np.full((n, n), -1, dtype=np.int32)
+    next_hop[sources, targets] = targets
+    next_hop[np.arange(n), np.arange(n)] = np.arange(n)
+
+    with np.errstate(invalid='ignore'):
+        for k in range(n):
+            candidate = distances[:, k, None] + distances[None, k, :]
+            better = candidate < distances
+            if better.any():
+                distances = np.where(better, candidate, distances)
+                next_hop = np.where(better, next_hop[:, k, None], next_hop)
+
+    # Um ciclo negativo aparece como distância negativa de um vértice até ele mesmo
+    on_cycle = np.flatnonzero(np.diag(distances) < 0)
+    negative_cycle = None
+    if on_cycle.size:
+        cycle = _spfa_csr(g, [int(on_cycle[0])])[2]
+        negative_cycle = [g.names[v] for v in cycle] if cycle else None
+
+    return {
+        'names': g.names,
+        'distances': distances,
+        'next_hop': next_hop,
+        'has_negative_cycle': bool(on_cycle.size),
+        'negative_cycle': negative_cycle
+    }
+
+
+def floyd_warshall_path(result: Dict, start: str, end: str) -> List[str]:
+    names = result['names']
+    index = {name: i for i, name in enumerate(names)}
+    if start not in index or end not in index:
+        return None
+
+    s, t = index[start], index[end]
+    next_hop = result['next_hop']
+    if next_hop[s, t] == -1:
+        return None
+
+    path = [s]
+    while path[-1] != t:
+        path.append(int(next_hop[path[-1], t]))
+        if len(path) > len(names):
+            raise ValueError("caminho passa por um ciclo negativo")
+    return [names[v] for v in path]
+
+
+class ALTIndex:
+    """Índice ALT (A*, landmarks e desigualdade triangular) para consultas ponto a ponto repetidas."""
+
+    VERSION = 1
+
+    def __init__(self, graph: CSRGraph, landmarks: List[int],
+                 from_landmarks: List[List[float]], to_landmarks: List[List[float]]):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+
+    @classmethod
+    def build(cls, graph: Graph, k: int = 8) -> 'ALTIndex':
+        g = as_csr(graph)
+        rev = g.reverse()
+        n = len(g.names)
+        k = min(k, n)
+
+        landmarks = []
+        from_landmarks = []
+        to_landmarks = []
+        if not n:
+            return cls(g, landmarks, from_landmarks, to_landmarks)
+
+        # Seleção "mais distante": cada landmark maximiza a menor distância aos já escolhidos
+        from_first = _dijkstra_csr(g, 0)[0]
+        candidate = max(range(n), key=lambda v: from_first[v] if from_first[v] < INF else -1.0)
+        closest = [INF] * n
+
+        for _ in range(k):
+            landmarks.append(candidate)
+            forward = _dijkstra_csr(g, candidate)[0]
+            backward = _dijkstra_csr(rev, candidate)[0]
+            from_landmarks.append(forward)
+            to_landmarks.append(backward)
+
+            chosen = set(landmarks)
+            best, candidate = -1.0, None
+            for v in range(n):
+                closest[v] = min(closest[v], forward[v], backward[v])
+                if closest[v] > best and v not in chosen:
+                    best, candidate = closest[v], v
+            if candidate is None:
+                break
+
+        return cls(g, landmarks, from_landmarks, to_landmarks)
+
+    def heuristic(self, t: int) -> Callable[[int], float]:
+        pairs = [(from_l, to_l, from_l[t], to_l[t])
+                 for from_l, to_l in zip(self.from_landmarks, self.to_landmarks)]
+
+        def bound(v: int) -> float:
+            best = 0.0
+            for from_l, to_l, from_t, to_t in pairs:
+                # d(v, t) >= d(L, t) - d(L, v)  e  d(v, t) >= d(v, L) - d(t, L)
+                if from_t < INF and from_l[v] < INF and from_t - from_l[v] > best:
+                    best = from_t - from_l[v]
+                if to_l[v] < INF and to_t < INF and to_l[v] - to_t > best:
+                    best = to_l[v] - to_t
+            return best
+
+        return bound
+
+    def query(self, start: str, end: str) -> Dict:
+        g = self.graph
+        if start not in g or end not in g:
+            return dijkstra(g, start, end)
+
+        s, t = g.index[start], g.index[end]
+        distances, parents, reached = _astar_csr(g, s, t, self.heuristic(t))
+
+        return _path_result(g, s, t, distances, parents, reached)
+
+    def save(self, path: Path):
+        def encode(row):
+            return [d if d < INF else None for d in row]
+
+        data = {
+            'version': self.VERSION,
+            'fingerprint': self.graph.fingerprint(),
+            'landmarks': [self.graph.names[v] for v in self.landmarks],
+            'from_landmarks': [encode(row) for row in self.from_landmarks],
+            'to_landmarks': [encode(row) for row in self.to_landmarks]
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: Path, graph: Graph) -> 'ALTIndex':
+        g = as_csr(graph)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != cls.VERSION or data.get('fingerprint') != g.fingerprint():
+            raise ValueError(f"Índice ALT em {path} não corresponde a esta versão do grafo")
+
+        def decode(row):
+            return [d if d is not None else INF for d in row]
+
+        return cls(g, [g.index[name] for name in data['landmarks']],
+                   [decode(row) for row in data['from_landmarks']],
+                   [decode(row) for row in data['to_landmarks']])
+
+    @classmethod
+    def load_or_build(cls, path: Path, graph: Graph, k: int = 8) -> 'ALTIndex':
+        try:
+            return cls.load(path, graph)
+        except (OSError, ValueError, KeyError):
+            index = cls.build(graph, k)
+            index.save(path)
+            return index
+
+
+class Timetable:
+    """Conexões (trechos com horário) em colunas, ordenadas pelo horário de partida.
+
+    Cada conexão vai de ``dep_stop`` para ``arr_stop`` entre ``dep_time`` e ``arr_time``
+    (segundos desde a época); conexões com o mesmo ``trip`` são trechos do mesmo voo,
+    em que o passageiro segue a bordo sem tempo de conexão.
+    """
+
+    def __init__(self, stops: List[str], dep_stop, arr_stop, dep_time, arr_time, trip):
+        self.stops = list(stops)
+        self.index = {name: i for i, name in enumerate(self.stops)}
+        self.dep_stop = dep_stop
+        self.arr_stop = arr_stop
+        self.dep_time = dep_time
+        self.arr_time = arr_time
+        self.trip = trip
+
+    def __len__(self) -> int:
+        return len(self.dep_time)
+
+    @classmethod
+    def from_connections(cls, connections: Iterable[tuple]) -> 'Timetable':
+        """Monta a tabela a partir de tuplas ``(origem, destino, partida, chegada, viagem)``."""
+        index: Dict[str, int] = {}
+        trips: Dict = {}
+        columns = ([], [], [], [], [])
+        for origem, destino, partida, chegada, viagem in connections:
+            columns[0].append(index.setdefault(origem, len(index)))
+            columns[1].append(index.setdefault(destino, len(index)))
+            columns[2].append(partida)
+            columns[3].append(chegada)
+            columns[4].append(trips.setdefault(viagem, len(trips)))
+
+        return cls.from_columns(list(index), *columns)
+
+    @classmethod
+    def from_columns(cls, stops: List[str], dep_stop, arr_stop, dep_time, arr_time, trip) -> 'Timetable':
+        """Monta a tabela a partir de colunas já codificadas (índices em ``stops`` e ids de viagem).
+
+        A ordem por partida é estável: conexões com o mesmo horário mantêm a ordem recebida.
+        """
+        dep_stop, arr_stop, dep_time, arr_time, trip = (np.asarray(c) for c in
+                                                        (dep_stop, arr_stop, dep_time, arr_time, trip))
+        order = np.lexsort((arr_time, dep_time)) if len(dep_time) else np.arange(0)
+        return cls(stops,
+                   _to_array('i', dep_stop[order]), _to_array('i', arr_stop[order]),
+                   _to_array('d', dep_time[order]), _to_array('d', arr_time[order]),
+                   _to_array('i', trip[order]))
+
+
+def connection_scan(timetable: Timetable, start: str, end: str, departure_time: float,
+                    min_transfer: Union[float, Dict[str, float]] = 0.0) -> Dict:
+    if start not in timetable.index or end not in timetable.index:
+        return {'arrival': INF, 'path_to_end': None, 'legs': []}
+
+    stops = timetable.stops
+    n = len(stops)
+    s, t = timetable.index[start], timetable.index[end]
+    dep_stop, arr_stop = timetable.dep_stop, timetable.arr_stop
+    dep_time, arr_time, trip = timetable.dep_time, timetable.arr_time, timetable.trip
+
+    if isinstance(min_transfer, dict):
+        transfer = [min_transfer.get(name, 0.0) for name in stops]
+    else:
+        transfer = [min_transfer] * n
+
+    arrival = [INF] * n
+    # ready[x]: a partir de quando dá para embarcar em x (chegada + tempo mínimo de conexão)
+    ready = [INF] * n
+    arrival[s] = ready[s] = departure_time
+    in_connection = [-1] * n
+    boarded: Dict[int, int] = {}
+
+    # Uma única varredura linear a partir da primeira partida >= departure_time
+    first = int(np.searchsorted(np.asarray(dep_time), departure_time, side='left'))
+    for c in range(first, len(dep_time)):
+        departure = dep_time[c]
+        if departure >= arrival[t]:
+            break
+
+        v = trip[c]
+        if v not in boarded:
+            if ready[dep_stop[c]] > departure:
+                continue
+            boarded[v] = c
+
+        x = arr_stop[c]
+        if arr_time[c] < arrival[x]:
+            arrival[x] = arr_time[c]
+            ready[x] = arr_time[c] + transfer[x]
+            in_connection[x] = c
+
+    if arrival[t] == INF:
+        return {'arrival': INF, 'path_to_end': None, 'legs': []}
+
+    legs = []
+    node = t
+    while node != s:
+        c = in_connection[node]
+        c_board = boarded[trip[c]]
+        legs.append({
+            'origem': stops[dep_stop[c_board]],
+            'destino': stops[node],
+            'partida': dep_time[c_board],
+            'chegada': arr_time[c],
+            'viagem': trip[c]
+        })
+        node = dep_stop[c_board]
+    legs.reverse()
+
+    return {
+        'arrival': arrival[t],
+        'path_to_end': [start] + [leg['destino'] for leg in legs],
+        'legs': legs
+    }
+
+
+def _dominates(a: Tuple, b: Tuple) -> bool:
+    # Rótulos (tempo, trechos, trocas, companhia): a pode imitar qualquer extensão de b
+    # pagando no máximo uma troca de companhia a mais (nenhuma se a ainda não embarcou)
+    return (a[0] <= b[0] and a[1] <= b[1]
+            and a[2] + (a[3] is not None and a[3] != b[3]) <= b[2])
+
+
+def pareto_paths(graph: Dict[str, List[Tuple[str, float, str]]], start: str, end: str,
+                 max_legs: int = None) -> List[Dict]:
+    """Frente de Pareto entre tempo, número de trechos e trocas de companhia.
+
+    ``graph`` é um multigrafo ``{origem: [(destino, tempo, companhia), ...]}``.
+    """
+    if start not in graph:
+        return []
+    if start == end:
+        return [{'time': 0.0, 'legs': 0, 'changes': 0, 'path': [start], 'airlines': []}]
+
+    # labels[i] = (tempo, trechos, trocas, companhia, vértice, rótulo pai)
+    labels = [(0.0, 0, 0, None, start, -1)]
+    bags: Dict[str, List[Tuple]] = {}
+    front: List[Tuple] = []
+    pq = [(0.0, 0, 0, 0)]
+
+    while pq:
+        time, legs, changes, i = heapq.heappop(pq)
+        _, _, _, airline, node, _ = labels[i]
+        key = (time, legs, changes, airline)
+
+        # A fila é lexicográfica: quem domina este rótulo já saiu antes dela
+        if any(_dominates(other, key) for other in bags.get(node, ())):
+            continue
+        if any(f[0] <= time and f[1] <= legs and f[2] <= changes for f in front):
+            continue
+        bags.setdefault(node, []).append(key)
+
+        if node == end:
+            front.append((time, legs, changes, i))
+            continue
+        if max_legs is not None and legs >= max_legs:
+            continue
+
+        for neighbor, duration, next_airline in graph.get(node, ()):
+            extra = 1 if airline is not None and next_airline != airline else 0
+            label = (time + duration, legs + 1, changes + extra, next_airline)
+            if any(_dominates(other, label) for other in bags.get(neighbor, ())):
+                continue
+            labels.append(label + (neighbor, i))
+            heapq.heappush(pq, (label[0], label[1], label[2], len(labels) - 1))
+
+    result = []
+    for time, legs, changes, i in front:
+        path, airlines = [], []
+        while i != -1:
+            _, _, _, airline, node, parent = labels[i]
+            path.append(node)
+            if airline is not None:
+                airlines.append(airline)
+            i = parent
+        path.reverse()
+        airlines.reverse()
+        result.append({'time': time, 'legs': legs, 'changes': changes, 'path': path, 'airlines': airlines})
+    return result
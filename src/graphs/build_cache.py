@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set
+
+VERSION = 1
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Registro de impressões digitais dos artefatos derivados (CSVs gerados a partir de outros).
+
+    Cada etapa guarda o hash do conteúdo das entradas e das saídas e os parâmetros
+    usados; ``run`` só chama o gerador quando algo disso mudou, quando uma saída
+    sumiu ou foi editada, ou quando a etapa está em ``force``. Para não reler
+    arquivos grandes a cada execução, o hash de um arquivo é reaproveitado enquanto
+    tamanho e mtime não mudarem.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.force: Set[str] = set()
+        self.force_all = False
+        self._files: Dict[str, list] = {}
+        self._stages: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            # Registro de outra versão ou corrompido: tudo é refeito
+            if data.get('version') == VERSION:
+                self._files = data.get('files', {})
+                self._stages = data.get('stages', {})
+
+    def digest(self, path: Path) -> str:
+        path = Path(path).resolve()
+        info = path.stat()
+        key = str(path)
+        known = self._files.get(key)
+        if known is not None and known[0] == info.st_size and known[1] == info.st_mtime_ns:
+            return known[2]
+        value = file_digest(path)
+        self._files[key] = [info.st_size, info.st_mtime_ns, value]
+        return value
+
+    def _digests(self, paths: Iterable[Path]) -> Dict[str, str]:
+        return {str(Path(path).resolve()): self.digest(path) for path in paths}
+
+    def is_fresh(self, stage: str, inputs: Iterable[Path], outputs: Iterable[Path], params: Dict = None) -> bool:
+        record = self._stages.get(stage)
+        if record is None or record['params'] != (params or {}):
+            return False
+        outputs = list(outputs)
+        if not all(Path(path).exists() for path in outputs):
+            return False
+        return record['inputs'] == self._digests(inputs) and record['outputs'] == self._digests(outputs)
+
+    def record(self, stage: str, inputs: Iterable[Path], outputs: Iterable[Path], params: Dict = None):
+        self._stages[stage] = {
+            'inputs': self._digests(inputs),
+            'outputs': self._digests(outputs),
+            'params': params or {}
+        }
+        self.save()
+
+    def run(self, stage: str, build: Callable[[], None], inputs: List[Path], outputs: List[Path],
+            params: Dict = None, force: bool = False) -> bool:
+        """Executa ``build`` se a etapa estiver desatualizada; devolve True se gerou de novo.
+
+        Inclua em ``inputs`` o próprio script gerador, para que mudanças nas regras também
+        invalidem o artefato.
+        """
+        forced = force or self.force_all or stage in self.force
+        if not forced and self.is_fresh(stage, inputs, outputs, params):
+            return False
+        build()
+        self.record(stage, inputs, outputs, params)
+        return True
+
+    def save(self):
+        data = {'version': VERSION, 'files': self._files, 'stages': self._stages}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(temporary, self.path)
+
+
+# Etapas com artefato em cache, na ordem do pipeline
+STAGES = ['bairros_unique', 'adjacencias_bairros']
+
+default_build_cache = BuildCache(Path(__file__).parent.parent.parent / 'data' / '.build_cache.json')
@@ -0,0 +1,118 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+from graphs.algorithms import Graph, INF, _bfs_layers_csr, _build_path, _path_result, _shortest_paths_csr
+from graphs.csr import CSRGraph, as_csr
+
+
+class ShortestPathTreeCache:
+    """Cache LRU de árvores de caminhos mínimos por (fingerprint do grafo, origem, algoritmo).
+
+    Cada árvore guarda distâncias e pais de todos os vértices em arrays compactos;
+    o orçamento ``max_bytes`` limita a soma dos tamanhos desses arrays. Passe sempre o
+    mesmo ``CSRGraph``: o fingerprint fica guardado no objeto e um acerto custa só a
+    caminhada pelos pais. Um dict é convertido (e hasheado) de novo a cada chamada.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._trees: 'OrderedDict[Tuple[str, Hashable, str], Tuple[array, array]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def clear(self):
+        self._trees.clear()
+        self.nbytes = 0
+
+    def _store(self, key: Tuple[str, Hashable, str], tree: Tuple[array, array]):
+        size = sum(values.itemsize * len(values) for values in tree)
+        if size > self.max_bytes:
+            return
+        self._trees[key] = tree
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, old = self._trees.popitem(last=False)
+            self.nbytes -= sum(values.itemsize * len(values) for values in old)
+
+    def _tree(self, g: CSRGraph, s: int, algorithm: str) -> Tuple[array, array]:
+        key = (g.fingerprint(), g.names[s], algorithm)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            self.hits += 1
+            return tree
+
+        self.misses += 1
+        if algorithm == 'dijkstra':
+            distances, parents, _ = _shortest_paths_csr(g, s)
+            tree = (array('d', distances), array('i', parents))
+        else:
+            # Na BFS o segundo array é a ordem de visita; as camadas saem das distâncias
+            depths = array('i', [-1]) * len(g.names)
+            order = array('i')
+            for depth, layer in enumerate(_bfs_layers_csr(g, [s])):
+                for v in layer:
+                    depths[v] = depth
+                order.extend(layer)
+            tree = (depths, order)
+        self._store(key, tree)
+        return tree
+
+    def dijkstra(self, graph: Graph, start: str, end: str = None) -> Dict:
+        if start not in graph:
+            return {'distances': {}, 'path_to_end': None, 'cost': INF}
+
+        g = as_csr(graph)
+        s = g.index[start]
+        t = g.index.get(end) if end is not None else None
+        distances, parents = self._tree(g, s, 'dijkstra')
+        reached = (v for v, d in enumerate(distances) if d < INF)
+        return _path_result(g, s, t, distances, parents, reached)
+
+    def path(self, graph: Graph, start: str, end: str) -> Tuple[float, list]:
+        """Custo e caminho ponto a ponto; com a árvore quente é só uma caminhada pelos pais."""
+        if start not in graph or end not in graph:
+            return INF, []
+
+        g = as_csr(graph)
+        s, t = g.index[start], g.index[end]
+        distances, parents = self._tree(g, s, 'dijkstra')
+        if distances[t] == INF:
+            return INF, []
+        return distances[t], [g.names[v] for v in _build_path(parents, s, t)]
+
+    def bfs(self, graph: Graph, start: str) -> Dict:
+        if start not in graph:
+            return {'order': [], 'layers': {}, 'distances': {}}
+
+        g = as_csr(graph)
+        names = g.names
+        depths, order = self._tree(g, g.index[start], 'bfs')
+
+        layers = {}
+        distances = {}
+        for v in order:
+            layers.setdefault(depths[v], []).append(names[v])
+            distances[names[v]] = depths[v]
+
+        return {
+            'order': [names[v] for v in order],
+            'layers': layers,
+            'distances': distances
+        }
+
+
+default_cache = ShortestPathTreeCache()
+
+
+def cached_dijkstra(graph: Graph, start: str, end: str = None) -> Dict:
+    return default_cache.dijkstra(graph, start, end)
+
+
+def cached_bfs(graph: Graph, start: str) -> Dict:
+    return default_cache.bfs(graph, start)
@@ -0,0 +1,250 @@
+import heapq
+import json
+from array import array
+from pathlib import Path
+from typing import Dict, Hashable, List, Tuple
+
+from graphs.algorithms import INF
+from graphs.csr import as_csr
+
+
+def _edge_arrays(n: int, edges: List[Tuple[int, int, float, int]]) -> Tuple[array, array, array, array]:
+    edges = sorted(edges, key=lambda edge: edge[0])
+    offsets = array('q', [0]) * (n + 1)
+    for u, _, _, _ in edges:
+        offsets[u + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    targets = array('i', (w for _, w, _, _ in edges))
+    weights = array('d', (weight for _, _, weight, _ in edges))
+    middles = array('i', (middle for _, _, _, middle in edges))
+    return offsets, targets, weights, middles
+
+
+class ContractionHierarchy:
+    """Hierarquia de contração: pré-processamento com atalhos e consulta bidirecional só para cima."""
+
+    VERSION = 1
+
+    def __init__(self, names: List[Hashable], rank: List[int],
+                 edges: List[Tuple[int, int, float, int]], fingerprint: str = None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.rank = list(rank)
+        self.edges = list(edges)
+        self.fingerprint = fingerprint
+
+        n = len(self.names)
+        up = [(u, w, weight, middle) for u, w, weight, middle in self.edges if rank[u] < rank[w]]
+        # A busca reversa sobe pelas arestas u -> w com rank[u] > rank[w], percorridas de w para u
+        down = [(w, u, weight, middle) for u, w, weight, middle in self.edges if rank[u] > rank[w]]
+        self._up = _edge_arrays(n, up)
+        self._down = _edge_arrays(n, down)
+        self._middle = {(u, w): middle for u, w, _, middle in self.edges}
+        self._weight = {(u, w): weight for u, w, weight, _ in self.edges}
+
+    @classmethod
+    def build(cls, graph, witness_settled: int = 64) -> 'ContractionHierarchy':
+        g = as_csr(graph)
+        n = len(g.names)
+        offsets, targets, weights = g.offsets, g.targets, g.weights
+
+        # Adjacências mutáveis do grafo restante: out_adj[u][w] = (peso, vértice do meio ou -1)
+        out_adj: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        in_adj: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                w = targets[e]
+                if w != u and (w not in out_adj[u] or weights[e] < out_adj[u][w][0]):
+                    out_adj[u][w] = (weights[e], -1)
+                    in_adj[w][u] = weights[e]
+
+        def witness_search(source: int, excluded: int, targets: Dict[int, float]) -> Dict[int, float]:
+            max_cost = max(targets.values())
+            remaining = len(targets)
+            distances = {source: 0.0}
+            pq = [(0.0, source)]
+            settled = 0
+            while pq and settled < witness_settled:
+                dist, node = heapq.heappop(pq)
+                if dist > max_cost:
+                    break
+                if dist > distances[node]:
+                    continue
+                settled += 1
+                if node in targets:
+                    remaining -= 1
+                    if not remaining:
+                        break
+                for neighbor, (weight, _) in out_adj[node].items():
+                    if neighbor == excluded:
+                        continue
+                    candidate = dist + weight
+                    if candidate < distances.get(neighbor, INF):
+                        distances[neighbor] = candidate
+                        heapq.heappush(pq, (candidate, neighbor))
+            return distances
+
+        def shortcuts_for(v: int) -> List[Tuple[int, int, float]]:
+            shortcuts = []
+            for u, weight_uv in in_adj[v].items():
+                costs = {w: weight_uv + weight_vw for w, (weight_vw, _) in out_adj[v].items() if w != u}
+                if not costs:
+                    continue
+                witnesses = witness_search(u, v, costs)
+                for w, cost in costs.items():
+                    if witnesses.get(w, INF) > cost:
+                        shortcuts.append((u, w, cost))
+            return shortcuts
+
+        deleted_neighbors = [0] * n
+
+        def priority(v: int, shortcuts: List) -> int:
+            # Diferença de arestas + vizinhos já contraídos (espalha a contração pelo grafo)
+            return len(shortcuts) - len(in_adj[v]) - len(out_adj[v]) + deleted_neighbors[v]
+
+        pq = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+        heapq.heapify(pq)
+        rank = [0] * n
+        contracted = bytearray(n)
+        edges = []
+        order = 0
+
+        while pq:
+            _, v = heapq.heappop(pq)
+            if contracted[v]:
+                continue
+
+            # Atualização preguiçosa: só contrai se continuar sendo o de menor prioridade
+            shortcuts = shortcuts_for(v)
+            current = priority(v, shortcuts)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, v))
+                continue
+
+            rank[v] = order
+            order += 1
+            contracted[v] = 1
+
+            for u, weight in in_adj[v].items():
+                edges.append((u, v, weight, out_adj[u][v][1]))
+                del out_adj[u][v]
+                deleted_neighbors[u] += 1
+            for w, (weight, middle) in out_adj[v].items():
+                edges.append((v, w, weight, middle))
+                del in_adj[w][v]
+                deleted_neighbors[w] += 1
+            in_adj[v] = {}
+            out_adj[v] = {}
+
+            for u, w, cost in shortcuts:
+                if w not in out_adj[u] or cost < out_adj[u][w][0]:
+                    out_adj[u][w] = (cost, v)
+                    in_adj[w][u] = cost
+
+        return cls(g.names, rank, edges, g.fingerprint())
+
+    def _unpack(self, path: List[int]) -> List[int]:
+        result = [path[0]]
+        stack = [(u, w) for u, w in zip(path, path[1:])]
+        stack.reverse()
+        while stack:
+            u, w = stack.pop()
+            middle = self._middle[(u, w)]
+            if middle == -1:
+                result.append(w)
+            else:
+                stack.append((middle, w))
+                stack.append((u, middle))
+        return result
+
+    def query(self, start: Hashable, end: Hashable) -> Dict:
+        if start not in self.index or end not in self.index:
+            return {'distances': {}, 'path_to_end': None, 'cost': INF}
+
+        s, t = self.index[start], self.index[end]
+        sides = (self._up, self._down)
+        distances = ({s: 0.0}, {t: 0.0})
+        parents = ({s: -1}, {t: -1})
+        pqs = ([(0.0, s)], [(0.0, t)])
+        best, meet = INF, -1
+
+        while pqs[0] or pqs[1]:
+            if pqs[0] and (not pqs[1] or pqs[0][0][0] <= pqs[1][0][0]):
+                side = 0
+            else:
+                side = 1
+
+            dist, node = heapq.heappop(pqs[side])
+            if dist >= best:
+                # Nenhum vértice restante deste lado melhora o encontro
+                pqs[side].clear()
+                continue
+            if dist > distances[side][node]:
+                continue
+
+            other = distances[1 - side].get(node, INF)
+            if dist + other < best:
+                best, meet = dist + other, node
+
+            offsets, targets, weights, _ = sides[side]
+            dist_side, parents_side = distances[side], parents[side]
+            for e in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[e]
+                candidate = dist + weights[e]
+                if candidate < dist_side.get(neighbor, INF):
+                    dist_side[neighbor] = candidate
+                    parents_side[neighbor] = node
+                    heapq.heappush(pqs[side], (candidate, neighbor))
+
+        if meet == -1:
+            return {'distances': {}, 'path_to_end': None, 'cost': INF}
+
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][meet]
+        while node != -1:
+            path.append(node)
+            node = parents[1][node]
+
+        path = self._unpack(path)
+        distances_on_path = {self.names[s]: 0.0}
+        total = 0.0
+        for u, w in zip(path, path[1:]):
+            total += self._weight[(u, w)]
+            distances_on_path[self.names[w]] = total
+
+        return {
+            'distances': distances_on_path,
+            'path_to_end': [self.names[v] for v in path],
+            'cost': best
+        }
+
+    def save(self, path: Path):
+        data = {
+            'version': self.VERSION,
+            'fingerprint': self.fingerprint,
+            'names': self.names,
+            'rank': self.rank,
+            'edges': [list(edge) for edge in self.edges]
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: Path, graph=None) -> 'ContractionHierarchy':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"Versão de hierarquia não suportada em {path}")
+        if graph is not None and data.get('fingerprint') != as_csr(graph).fingerprint():
+            raise ValueError(f"Hierarquia em {path} não corresponde a esta versão do grafo")
+
+        edges = [(u, w, weight, middle) for u, w, weight, middle in data['edges']]
+        return cls(data['names'], data['rank'], edges, data.get('fingerprint'))
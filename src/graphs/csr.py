@@ -0,0 +1,193 @@
+import hashlib
+import json
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class CSRGraph:
+    """Grafo dirigido em formato CSR (compressed sparse row) com vértices indexados por inteiros.
+
+    As arestas que saem do vértice ``u`` ocupam as posições ``offsets[u]`` até
+    ``offsets[u + 1]`` de ``targets`` e ``weights``; ``names`` e ``index`` fazem a
+    tradução entre o id inteiro e o nome original do vértice.
+    """
+
+    __slots__ = ('names', 'index', 'offsets', 'targets', 'weights', '_reverse', '_max_int_weight', '_fingerprint',
+                 '_snapshot')
+
+    def __init__(self, names: Iterable[Hashable], offsets, targets, weights=None):
+        self.names: List[Hashable] = list(names)
+        self.index: Dict[Hashable, int] = {name: i for i, name in enumerate(self.names)}
+        self.offsets = offsets
+        self.targets = targets
+        if weights is None:
+            weights = array('d', [1.0]) * len(targets)
+        self.weights = weights
+        self._reverse: Optional['CSRGraph'] = None
+        self._max_int_weight: Optional[int] = None
+        self._fingerprint: Optional[str] = None
+        self._snapshot: Optional[str] = None
+
+        if len(offsets) != len(self.names) + 1:
+            raise ValueError("offsets deve ter len(names) + 1 posições")
+        if len(targets) != len(weights):
+            raise ValueError("targets e weights devem ter o mesmo tamanho")
+
+    def __reduce__(self):
+        if self._snapshot is not None:
+            # Grafo mapeado de um snapshot: o outro processo mapeia o mesmo arquivo
+            return (_load_snapshot_graph, (self._snapshot,))
+        # Só os arrays viajam no pickle; o transposto é recalculado se preciso
+        return (CSRGraph, (self.names, self.offsets, self.targets, self.weights))
+
+    @classmethod
+    def from_dict(cls, graph: Dict, extra_nodes: Iterable[Hashable] = ()) -> 'CSRGraph':
+        """Converte uma lista de adjacência (``{u: {v: peso}}`` ou ``{u: [v, ...]}``) para CSR."""
+        vertices = dict.fromkeys(graph)
+        for neighbors in graph.values():
+            vertices.update(dict.fromkeys(neighbors))
+        vertices.update(dict.fromkeys(extra_nodes))
+
+        # Ids em ordem de nome mantêm o desempate do heap igual ao das versões com dicts
+        try:
+            names = sorted(vertices)
+        except TypeError:
+            names = list(vertices)
+        index = {name: i for i, name in enumerate(names)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        for name in names:
+            neighbors = graph.get(name, ())
+            if hasattr(neighbors, 'items'):
+                for neighbor, weight in neighbors.items():
+                    targets.append(index[neighbor])
+                    weights.append(weight)
+            else:
+                for neighbor in neighbors:
+                    targets.append(index[neighbor])
+                    weights.append(1.0)
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, weights)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple], nodes: Iterable[Hashable] = ()) -> 'CSRGraph':
+        """Monta o CSR a partir de tuplas ``(origem, destino, peso)``, mantendo a última aresta repetida."""
+        graph: Dict[Hashable, Dict[Hashable, float]] = {}
+        for origem, destino, peso in edges:
+            graph.setdefault(origem, {})[destino] = peso
+        return cls.from_dict(graph, nodes)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def edge_range(self, u: int) -> range:
+        return range(self.offsets[u], self.offsets[u + 1])
+
+    def neighbors(self, name) -> Dict[Hashable, float]:
+        u = self.index[name]
+        names, targets, weights = self.names, self.targets, self.weights
+        return {names[targets[e]]: weights[e] for e in self.edge_range(u)}
+
+    def get(self, name, default=None):
+        if name not in self.index:
+            return default
+        return self.neighbors(name)
+
+    def reverse(self) -> 'CSRGraph':
+        """Grafo transposto (arestas invertidas), calculado uma vez e reaproveitado."""
+        if self._reverse is None:
+            n = len(self.names)
+            offsets, targets, weights = self.as_numpy()
+
+            # Ordena por (destino, posição da aresta): estável e bem mais rápido que argsort estável
+            if len(targets) < 2 ** 32:
+                keys = (targets.astype(np.int64) << 32) | np.arange(len(targets), dtype=np.int64)
+                keys.sort()
+                order = keys & 0xFFFFFFFF
+            else:
+                order = np.argsort(targets, kind='stable')
+            sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(offsets))
+            counts = np.bincount(targets, minlength=n)
+
+            reverse = CSRGraph.__new__(CSRGraph)
+            reverse.names = self.names
+            reverse.index = self.index
+            reverse.offsets = _to_array('q', np.concatenate(([0], np.cumsum(counts))))
+            reverse.targets = _to_array('i', sources[order])
+            reverse.weights = _to_array('d', weights[order])
+            reverse._reverse = self
+            reverse._max_int_weight = self._max_int_weight
+            reverse._fingerprint = None
+            reverse._snapshot = None
+            self._reverse = reverse
+        return self._reverse
+
+    def as_numpy(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Visões NumPy (sem cópia quando possível) de offsets, targets e weights."""
+        return (np.asarray(self.offsets, dtype=np.int64),
+                np.asarray(self.targets, dtype=np.int32),
+                np.asarray(self.weights, dtype=np.float64))
+
+    def fingerprint(self) -> str:
+        """Hash do conteúdo (nomes, offsets, targets e weights) que identifica a versão do grafo."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            digest.update(json.dumps(self.names, default=str, ensure_ascii=False).encode('utf-8'))
+            for values in self.as_numpy():
+                digest.update(values.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def max_integer_weight(self) -> Optional[int]:
+        """Maior peso quando todos são inteiros não negativos; None caso contrário."""
+        if self._max_int_weight is None:
+            weights = self.as_numpy()[2]
+            if not len(weights):
+                self._max_int_weight = 0
+            elif np.isfinite(weights).all() and (weights >= 0).all() and (weights == np.floor(weights)).all():
+                self._max_int_weight = int(weights.max())
+            else:
+                self._max_int_weight = -1
+        return self._max_int_weight if self._max_int_weight >= 0 else None
+
+    def to_dict(self) -> Dict[Hashable, Dict[Hashable, float]]:
+        return {name: self.neighbors(name) for name in self.names}
+
+
+def _to_array(typecode: str, values: np.ndarray) -> array:
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return result
+
+
+def _load_snapshot_graph(path: str) -> CSRGraph:
+    from graphs.io import carregar_snapshot
+    return carregar_snapshot(path).grafo
+
+
+def as_csr(graph, extra_nodes: Iterable[Hashable] = ()) -> CSRGraph:
+    if isinstance(graph, CSRGraph):
+        missing = [node for node in extra_nodes if node not in graph.index]
+        if not missing:
+            return graph
+        graph = graph.to_dict()
+    return CSRGraph.from_dict(graph, extra_nodes)
@@ -0,0 +1,149 @@
+import heapq
+from typing import Dict, Hashable, List, Set
+
+from graphs.algorithms import Graph, INF, _shortest_paths_csr
+from graphs.csr import as_csr
+
+
+class DynamicSSSP:
+    """Árvore de caminhos mínimos de uma origem, reparada a cada mudança de aresta.
+
+    Segue a ideia de Ramalingam–Reps: uma redução de peso propaga a melhora a partir
+    do destino da aresta; um aumento (ou remoção) de aresta da árvore só recalcula a
+    subárvore pendurada nela. As arestas são dirigidas; para grafos não dirigidos,
+    atualize os dois sentidos.
+    """
+
+    def __init__(self, graph: Graph, source: Hashable):
+        g = as_csr(graph, [source])
+        names = g.names
+
+        self.source = source
+        self.out_adj: Dict[Hashable, Dict[Hashable, float]] = {name: {} for name in names}
+        self.in_adj: Dict[Hashable, Dict[Hashable, float]] = {name: {} for name in names}
+        for u, name in enumerate(names):
+            for e in g.edge_range(u):
+                neighbor = names[g.targets[e]]
+                self.out_adj[name][neighbor] = g.weights[e]
+                self.in_adj[neighbor][name] = g.weights[e]
+
+        distances, parents, reached = _shortest_paths_csr(g, g.index[source])
+        self.distances: Dict[Hashable, float] = {names[v]: distances[v] for v in reached}
+        self.parents: Dict[Hashable, Hashable] = {names[v]: names[parents[v]] for v in reached if parents[v] != -1}
+        self.children: Dict[Hashable, Set[Hashable]] = {name: set() for name in names}
+        for node, parent in self.parents.items():
+            self.children[parent].add(node)
+
+    def _add_node(self, node: Hashable):
+        if node not in self.out_adj:
+            self.out_adj[node] = {}
+            self.in_adj[node] = {}
+            self.children[node] = set()
+
+    def _set_parent(self, node: Hashable, parent: Hashable):
+        old = self.parents.pop(node, None)
+        if old is not None:
+            self.children[old].discard(node)
+        if parent is not None:
+            self.parents[node] = parent
+            self.children[parent].add(node)
+
+    def _propagate(self, pq: List, allowed: Set[Hashable] = None) -> Set[Hashable]:
+        distances = self.distances
+        changed = set()
+        while pq:
+            dist, node = heapq.heappop(pq)
+            if dist > distances.get(node, INF):
+                continue
+            changed.add(node)
+            for neighbor, weight in self.out_adj[node].items():
+                if allowed is not None and neighbor not in allowed:
+                    continue
+                candidate = dist + weight
+                if candidate < distances.get(neighbor, INF):
+                    distances[neighbor] = candidate
+                    self._set_parent(neighbor, node)
+                    heapq.heappush(pq, (candidate, neighbor))
+        return changed
+
+    def _decrease(self, u: Hashable, v: Hashable, weight: float) -> Set[Hashable]:
+        candidate = self.distances.get(u, INF) + weight
+        if candidate >= self.distances.get(v, INF):
+            return set()
+        self.distances[v] = candidate
+        self._set_parent(v, u)
+        return self._propagate([(candidate, v)])
+
+    def _increase(self, v: Hashable) -> Set[Hashable]:
+        # Só a subárvore de v pode piorar: os demais vértices têm caminhos que não passam por ela
+        affected = set()
+        stack = [v]
+        while stack:
+            node = stack.pop()
+            affected.add(node)
+            stack.extend(self.children[node])
+
+        for node in affected:
+            self.distances.pop(node, None)
+            self._set_parent(node, None)
+
+        pq = []
+        for node in affected:
+            best, best_parent = INF, None
+            for parent, weight in self.in_adj[node].items():
+                if parent not in affected and self.distances.get(parent, INF) + weight < best:
+                    best, best_parent = self.distances[parent] + weight, parent
+            if best_parent is not None:
+                self.distances[node] = best
+                self._set_parent(node, best_parent)
+                pq.append((best, node))
+        heapq.heapify(pq)
+
+        self._propagate(pq, affected)
+        return affected
+
+    def set_edge(self, u: Hashable, v: Hashable, weight: float) -> Set[Hashable]:
+        """Insere ou repondera a aresta ``u -> v``; devolve os vértices cuja distância foi revista."""
+        if weight < 0:
+            raise ValueError("DynamicSSSP exige pesos não negativos")
+        self._add_node(u)
+        self._add_node(v)
+
+        old = self.out_adj[u].get(v)
+        self.out_adj[u][v] = weight
+        self.in_adj[v][u] = weight
+
+        if old is not None and weight > old and self.parents.get(v) == u:
+            return self._increase(v)
+        return self._decrease(u, v, weight)
+
+    def remove_edge(self, u: Hashable, v: Hashable) -> Set[Hashable]:
+        if v not in self.out_adj.get(u, {}):
+            raise KeyError(f"aresta inexistente: {u} -> {v}")
+        del self.out_adj[u][v]
+        del self.in_adj[v][u]
+
+        if self.parents.get(v) == u:
+            return self._increase(v)
+        return set()
+
+    def path_to(self, target: Hashable) -> List[Hashable]:
+        if target not in self.distances:
+            return None
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self.parents[path[-1]])
+        path.reverse()
+        return path
+
+    def result(self, end: Hashable = None) -> Dict:
+        """Resultado no mesmo formato de ``dijkstra``."""
+        result = {
+            'distances': dict(self.distances),
+            'path_to_end': None,
+            'cost': INF
+        }
+        if end is not None and end in self.distances:
+            result['path_to_end'] = self.path_to(end)
+            result['cost'] = self.distances[end]
+        return result
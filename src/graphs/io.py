@@ -1,7 +1,319 @@
 from pyvis.network import Network
 from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
 import csv
+import json
+import mmap
 import os
+import struct
+import sys
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from graphs.build_cache import BuildCache, default_build_cache
+from graphs.csr import CSRGraph, _to_array, as_csr
+
+
+def normalizar_nome(nome: str) -> str:
+    """Remove acentos (decomposição NFD) e espaços das pontas, mantendo maiúsculas."""
+    sem_acento = unicodedata.normalize('NFD', nome)
+    sem_acento = ''.join(char for char in sem_acento if unicodedata.category(char) != 'Mn')
+    return sem_acento.strip()
+
+
+class AdjacenciasBairros:
+    """Conexões de adjacencias_bairros.csv lidas uma vez, com as visões que cada script usa.
+
+    As visões são calculadas sob demanda e compartilhadas entre os chamadores: não modifique.
+    """
+
+    def __init__(self, conexoes: List[Tuple[str, str, float]]):
+        self.conexoes = conexoes
+        self.vertices: Set[str] = set()
+        self.arestas: Set[Tuple[str, str]] = set()
+        for origem, destino, _ in conexoes:
+            self.vertices.add(origem)
+            self.vertices.add(destino)
+            self.arestas.add(tuple(sorted([origem, destino])))
+        self._pesos = None
+        self._conjuntos = None
+        self._csr = None
+        self._csr_saltos = None
+
+    def pesos(self) -> Dict[str, Dict[str, float]]:
+        """Lista de adjacência não dirigida ``{bairro: {vizinho: peso}}``."""
+        if self._pesos is None:
+            pesos: Dict[str, Dict[str, float]] = {}
+            for origem, destino, peso in self.conexoes:
+                pesos.setdefault(origem, {})[destino] = peso
+                pesos.setdefault(destino, {})[origem] = peso
+            self._pesos = pesos
+        return self._pesos
+
+    def conjuntos(self) -> Dict[str, Set[str]]:
+        """Lista de adjacência não dirigida ``{bairro: {vizinhos}}``, sem pesos."""
+        if self._conjuntos is None:
+            self._conjuntos = {bairro: set(vizinhos) for bairro, vizinhos in self.pesos().items()}
+        return self._conjuntos
+
+    def graus(self) -> Dict[str, int]:
+        return {bairro: len(vizinhos) for bairro, vizinhos in self.pesos().items()}
+
+    def csr(self) -> CSRGraph:
+        if self._csr is None:
+            self._csr = CSRGraph.from_dict(self.pesos())
+        return self._csr
+
+    def csr_saltos(self) -> CSRGraph:
+        """CSR sem pesos (cada aresta vale 1), para contagem de saltos."""
+        if self._csr_saltos is None:
+            self._csr_saltos = CSRGraph.from_dict(self.conjuntos())
+        return self._csr_saltos
+
+
+_adjacencias_cache: Dict[Tuple[str, int, int], AdjacenciasBairros] = {}
+
+
+def carregar_adjacencias(csv_path: Path = None) -> AdjacenciasBairros:
+    """Lê adjacencias_bairros.csv uma vez por processo; o cache é refeito se o arquivo mudar."""
+    if csv_path is None:
+        csv_path = Path(__file__).parent.parent.parent / 'data' / 'adjacencias_bairros.csv'
+    csv_path = Path(csv_path).resolve()
+    info = csv_path.stat()
+    chave = (str(csv_path), info.st_mtime_ns, info.st_size)
+
+    if chave not in _adjacencias_cache:
+        conexoes = []
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            for linha in csv.DictReader(f):
+                origem = normalizar_nome(linha.get('bairro_origem') or '')
+                destino = normalizar_nome(linha.get('bairro_destino') or '')
+                if not origem or not destino:
+                    continue
+                try:
+                    peso = float((linha.get('peso') or '').strip() or 1.0)
+                except ValueError:
+                    peso = 1.0
+                conexoes.append((origem, destino, peso))
+
+        for antiga in [c for c in _adjacencias_cache if c[0] == chave[0]]:
+            del _adjacencias_cache[antiga]
+        _adjacencias_cache[chave] = AdjacenciasBairros(conexoes)
+
+    return _adjacencias_cache[chave]
+
+
+SNAPSHOT_MAGIC = b'GRAFOSNP'
+SNAPSHOT_VERSAO = 1
+_CABECALHO = struct.Struct('<8sII')
+_ALINHAMENTO = 64
+
+
+def _alinhar(posicao: int) -> int:
+    return -(-posicao // _ALINHAMENTO) * _ALINHAMENTO
+
+
+def _coluna(valores, tamanho: int, nome: str) -> Tuple[np.ndarray, List[str]]:
+    valores = np.asarray(valores)
+    if len(valores) != tamanho:
+        raise ValueError(f"coluna {nome!r} tem {len(valores)} valores, esperado {tamanho}")
+    if valores.dtype.kind in 'USO':
+        # Texto vira categórica: códigos int32 no arquivo, categorias nos metadados
+        categorias, codigos = np.unique(valores.astype(str), return_inverse=True)
+        return codigos.astype('<i4'), categorias.tolist()
+    if valores.dtype.kind not in 'biuf':
+        raise TypeError(f"coluna {nome!r} com tipo não suportado: {valores.dtype}")
+    return valores.astype(valores.dtype.newbyteorder('<')), None
+
+
+def salvar_snapshot(path: Path, graph, atributos_vertices: Dict[str, Sequence] = None,
+                    atributos_arestas: Dict[str, Sequence] = None):
+    """Grava o grafo em um snapshot binário versionado, pronto para ``carregar_snapshot``.
+
+    Layout: cabeçalho fixo (magic, versão, tamanho dos metadados), metadados em JSON
+    e as seções de dados, cada uma alinhada em 64 bytes. Os atributos de aresta seguem
+    a ordem das arestas no CSR (a mesma de ``targets``).
+    """
+    g = as_csr(graph)
+    if not all(isinstance(name, str) for name in g.names):
+        raise TypeError("o snapshot só guarda vértices com nomes str")
+    if any('\0' in name for name in g.names):
+        raise ValueError("nomes de vértice não podem conter '\\0'")
+
+    offsets, targets, weights = g.as_numpy()
+    secoes = [
+        ('nomes', np.frombuffer('\0'.join(g.names).encode('utf-8'), dtype=np.uint8)),
+        ('offsets', offsets.astype('<i8')),
+        ('targets', targets.astype('<i4')),
+        ('weights', weights.astype('<f8'))
+    ]
+
+    colunas = []
+    for escopo, atributos, tamanho in (('vertice', atributos_vertices, g.num_vertices),
+                                       ('aresta', atributos_arestas, g.num_edges)):
+        for nome, valores in (atributos or {}).items():
+            dados, categorias = _coluna(valores, tamanho, nome)
+            colunas.append({'nome': nome, 'escopo': escopo, 'dtype': dados.dtype.str,
+                            'categorias': categorias})
+            secoes.append((f'{escopo}:{nome}', dados))
+
+    posicao = 0
+    layout = {}
+    for nome, dados in secoes:
+        layout[nome] = [posicao, dados.nbytes]
+        posicao = _alinhar(posicao + dados.nbytes)
+
+    metadados = json.dumps({
+        'num_vertices': g.num_vertices,
+        'num_edges': g.num_edges,
+        'fingerprint': g.fingerprint(),
+        'secoes': layout,
+        'colunas': colunas
+    }, ensure_ascii=False).encode('utf-8')
+    inicio_dados = _alinhar(_CABECALHO.size + len(metadados))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporario = path.with_name(path.name + '.tmp')
+    with open(temporario, 'wb') as f:
+        f.write(_CABECALHO.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSAO, len(metadados)))
+        f.write(metadados)
+        for nome, dados in secoes:
+            f.seek(inicio_dados + layout[nome][0])
+            f.write(dados.tobytes())
+        f.truncate(inicio_dados + posicao)
+    # Troca atômica: processos com o arquivo antigo mapeado continuam lendo a versão antiga
+    os.replace(temporario, path)
+
+
+class SnapshotGrafo:
+    """Snapshot mapeado em memória: ``grafo`` e as colunas apontam direto para as páginas do arquivo.
+
+    Os arrays são somente leitura e compartilham o page cache entre processos; ao
+    ser enviado para outro processo, o ``grafo`` leva só o caminho e é remapeado lá.
+    """
+
+    def __init__(self, path: Path, grafo: CSRGraph, colunas: Dict[Tuple[str, str], np.ndarray],
+                 categorias: Dict[Tuple[str, str], List[str]]):
+        self.path = path
+        self.grafo = grafo
+        self.colunas = colunas
+        self.categorias = categorias
+
+    def _valores(self, escopo: str, nome: str) -> np.ndarray:
+        if (escopo, nome) not in self.colunas:
+            raise KeyError(f"atributo de {escopo} inexistente: {nome}")
+        valores = self.colunas[(escopo, nome)]
+        categorias = self.categorias.get((escopo, nome))
+        if categorias is not None:
+            return np.asarray(categorias, dtype=object)[valores]
+        return valores
+
+    def vertice(self, nome: str) -> np.ndarray:
+        """Coluna de atributo dos vértices, na ordem de ``grafo.names``."""
+        return self._valores('vertice', nome)
+
+    def aresta(self, nome: str) -> np.ndarray:
+        """Coluna de atributo das arestas, na ordem de ``grafo.targets``."""
+        return self._valores('aresta', nome)
+
+
+def carregar_snapshot(path: Path) -> SnapshotGrafo:
+    path = Path(path).resolve()
+    with open(path, 'rb') as f:
+        cabecalho = f.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size:
+            raise ValueError(f"Snapshot truncado em {path}")
+        magic, versao, tamanho = _CABECALHO.unpack(cabecalho)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} não é um snapshot de grafo")
+        if versao != SNAPSHOT_VERSAO:
+            raise ValueError(f"Versão de snapshot não suportada em {path}")
+        metadados = json.loads(f.read(tamanho).decode('utf-8'))
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    inicio_dados = _alinhar(_CABECALHO.size + tamanho)
+    buffer = memoryview(mapa)
+
+    def secao(nome: str) -> memoryview:
+        inicio, nbytes = metadados['secoes'][nome]
+        return buffer[inicio_dados + inicio:inicio_dados + inicio + nbytes]
+
+    def array_csr(nome: str, typecode: str, dtype: str):
+        if sys.byteorder == 'little':
+            # memoryview tipado: leitura elemento a elemento tão rápida quanto array, sem cópia
+            return secao(nome).cast(typecode)
+        return _to_array(typecode, np.frombuffer(secao(nome), dtype=dtype))
+
+    nomes = bytes(secao('nomes')).decode('utf-8')
+    nomes = nomes.split('\0') if metadados['num_vertices'] else []
+
+    grafo = CSRGraph(nomes, array_csr('offsets', 'q', '<i8'), array_csr('targets', 'i', '<i4'),
+                     array_csr('weights', 'd', '<f8'))
+    grafo._fingerprint = metadados['fingerprint']
+    grafo._snapshot = str(path)
+
+    colunas = {}
+    categorias = {}
+    for coluna in metadados['colunas']:
+        chave = (coluna['escopo'], coluna['nome'])
+        colunas[chave] = np.frombuffer(secao(f"{coluna['escopo']}:{coluna['nome']}"), dtype=coluna['dtype'])
+        if coluna['categorias'] is not None:
+            categorias[chave] = coluna['categorias']
+
+    return SnapshotGrafo(path, grafo, colunas, categorias)
+
+
+_COLUNAS_VOOS = {
+    'Voos': 'voo',
+    'Companhia.Aerea': 'companhia',
+    'Situacao.Voo': 'situacao',
+    'Partida.Real': 'partida',
+    'Chegada.Real': 'chegada',
+    'Aeroporto.Origem': 'origem',
+    'Cidade.Origem': 'cidade_origem',
+    'Estado.Origem': 'estado_origem',
+    'LatOrig': 'lat_origem',
+    'LongOrig': 'lon_origem',
+    'Aeroporto.Destino': 'destino',
+    'Cidade.Destino': 'cidade_destino',
+    'Estado.Destino': 'estado_destino',
+    'LatDest': 'lat_destino',
+    'LongDest': 'lon_destino'
+}
+_CATEGORICAS_VOOS = ['voo', 'companhia', 'situacao', 'origem', 'cidade_origem', 'estado_origem',
+                     'destino', 'cidade_destino', 'estado_destino']
+_EPOCA = pd.Timestamp(0, tz='UTC')
+
+
+def ler_voos(csv_path: Path, chunksize: int = 100_000, incluir_cancelados: bool = False) -> Iterator[pd.DataFrame]:
+    """Lê um export de voos da ANAC (voos_brasil.csv) em blocos colunares de até ``chunksize`` linhas.
+
+    Textos viram colunas categóricas, coordenadas viram float64 e os horários reais
+    viram segundos desde a época (NaN quando ausentes), junto com ``tempo`` em horas.
+    O índice de cada bloco é a posição da linha no arquivo.
+    """
+    colunas = {original: ('category' if nome in _CATEGORICAS_VOOS else str)
+               for original, nome in _COLUNAS_VOOS.items()}
+    leitor = pd.read_csv(csv_path, encoding='utf-8-sig', usecols=list(_COLUNAS_VOOS), dtype=colunas,
+                         keep_default_na=False, chunksize=chunksize)
+
+    for bloco in leitor:
+        bloco = bloco.rename(columns=_COLUNAS_VOOS)
+        if not incluir_cancelados:
+            bloco = bloco[bloco['situacao'] != 'Cancelado']
+
+        for coluna in ('lat_origem', 'lon_origem', 'lat_destino', 'lon_destino'):
+            bloco[coluna] = pd.to_numeric(bloco[coluna], errors='coerce')
+        for coluna in ('partida', 'chegada'):
+            horarios = pd.to_datetime(bloco[coluna], format='ISO8601', utc=True, errors='coerce')
+            bloco[coluna] = (horarios - _EPOCA) / pd.Timedelta(seconds=1)
+        bloco['tempo'] = (bloco['chegada'] - bloco['partida']) / 3600
+
+        yield bloco
 
 
 def _criar_menu_navegacao():
@@ -251,13 +563,7 @@ def gerar_grafo_bairros(base_path: Path = None):
     print(f"Arquivo criado: {output_html}")
 
 
-def gerar_csv_bairros_microrregiao(base_path: Path = None):
-    if base_path is None:
-        base_path = Path(__file__).parent.parent.parent
-    
-    input_csv = base_path / 'data' / 'bairros_recife.csv'
-    output_csv = base_path / 'data' / 'bairros_unique.csv'
-    
+def _escrever_csv_bairros_microrregiao(input_csv: Path, output_csv: Path):
     bairros_data = []
     
     with open(input_csv, 'r', encoding='utf-8') as f:
@@ -283,6 +589,21 @@ def gerar_csv_bairros_microrregiao(base_path: Path = None):
     print(f"CSV de bairros criado: {output_csv}")
 
 
+def gerar_csv_bairros_microrregiao(base_path: Path = None, force: bool = False, cache: BuildCache = None):
+    """Gera bairros_unique.csv; pula a etapa se bairros_recife.csv e este módulo não mudaram."""
+    if base_path is None:
+        base_path = Path(__file__).parent.parent.parent
+    
+    input_csv = base_path / 'data' / 'bairros_recife.csv'
+    output_csv = base_path / 'data' / 'bairros_unique.csv'
+    cache = cache or default_build_cache
+
+    gerado = cache.run('bairros_unique', lambda: _escrever_csv_bairros_microrregiao(input_csv, output_csv),
+                       inputs=[input_csv, Path(__file__)], outputs=[output_csv], force=force)
+    if not gerado:
+        print(f"CSV de bairros sem alterações: {output_csv}")
+
+
 if __name__ == '__main__':
     gerar_grafo_bairros()
     gerar_csv_bairros_microrregiao()
@@ -1,46 +1,36 @@
 import csv
 import json
+from itertools import islice
 from pathlib import Path
 import re
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from graphs.algorithms import dijkstra as dijkstra_base
+from graphs.algorithms import bidirectional_dijkstra, k_shortest_paths, ALTIndex
+from graphs.io import carregar_adjacencias
 
 
 def carregas_grafos_pesos(csv_path):
-    grafo = {}
-    vertices = set()
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for linha in reader:
-            origem = linha['bairro_origem'].strip()
-            destino = linha['bairro_destino'].strip()
-            peso = int(linha['peso'].strip())
-            
-            vertices.add(origem)
-            vertices.add(destino)
-            
-            if origem not in grafo:
-                grafo[origem] = {}
-            if destino not in grafo:
-                grafo[destino] = {}
-            
-            grafo[origem][destino] = peso
-            grafo[destino][origem] = peso
-    
-    return grafo, vertices
+    dados = carregar_adjacencias(csv_path)
+    return dados.pesos(), dados.vertices
 
 
-def dijkstra(grafo, origem, destino):
-    result = dijkstra_base(grafo, origem, destino)
+def dijkstra(grafo, origem, destino, indice_alt=None):
+    if indice_alt is not None:
+        result = indice_alt.query(origem, destino)
+    else:
+        result = bidirectional_dijkstra(grafo, origem, destino)
     if result['path_to_end'] is None:
         return float('inf'), []
     return result['cost'], result['path_to_end']
 
 
+def rotas_alternativas(grafo, origem, destino, k=2):
+    # As k rotas seguintes à principal: a primeira do k_shortest_paths é o próprio caminho mínimo
+    rotas = islice(k_shortest_paths(grafo, origem, destino, k + 1), 1, None)
+    return [(r['cost'], r['path_to_end']) for r in rotas]
+
+
 def main():
     base_path = Path(__file__).parent.parent.parent
     input_path = base_path / "data" / "adjacencias_bairros.csv"
@@ -64,6 +54,8 @@ def main():
             enderecos.append((addr_x, addr_y))
 
     grafo, vertices = carregas_grafos_pesos(input_path)
+    grafo_csr = carregar_adjacencias(input_path).csr()
+    indice_alt = ALTIndex.load_or_build(base_path / "out" / "alt_bairros.json", grafo_csr)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     resultados = []
@@ -74,7 +66,7 @@ def main():
             print(f"Um dos bairros não está no grafo: {bairro_x}, {bairro_y}")
             continue
 
-        custo, caminho = dijkstra(grafo, bairro_x, bairro_y)
+        custo, caminho = dijkstra(grafo_csr, bairro_x, bairro_y, indice_alt)
         caminho_str = " -> ".join(caminho) if caminho else "Sem caminho"
 
         resultados.append({
@@ -87,7 +79,10 @@ def main():
         })
 
         chave = f"{bairro_x}-{bairro_y}"
-        distancias[chave] = {'caminho': caminho}
+        distancias[chave] = {
+            'caminho': caminho,
+            'alternativas': rotas_alternativas(grafo_csr, bairro_x, bairro_y)
+        }
     
     with open(output_path, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=['X', 'Y', 'bairro_X', 'bairro_Y', 'custo', 'caminho'])
@@ -111,9 +106,15 @@ def main():
             'X': r['X'],
             'Y': r['Y'],
             'custo': r['custo'],
-            'caminho': r['caminho']
+            'caminho': r['caminho'],
+            'alternativas': [
+                {'custo': custo, 'caminho': " -> ".join(caminho)}
+                for custo, caminho in distancias[f"{bx}-{by}"]['alternativas']
+            ]
         }
         with open(arquivo_path, 'w', encoding='utf-8') as jf:
             json.dump(data, jf, ensure_ascii=False, indent=2)
-    
-main()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,12 @@
 import csv
 from pathlib import Path
-from collections import defaultdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from graphs.io import carregar_adjacencias
 
 def calculate_grau(csv_path):
-    conexoes = defaultdict(set)
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for linha in reader:
-            origem = linha['bairro_origem'].strip()
-            destino = linha['bairro_destino'].strip()
-            
-            conexoes[origem].add(destino)
-            conexoes[destino].add(origem)
-    
-    grau = {}
-    for bairro, vizinhos in conexoes.items():
-        grau[bairro] = len(vizinhos)
-    
-    return grau
+    return carregar_adjacencias(csv_path).graus()
 
 def main():
     base_path = Path(__file__).parent.parent.parent
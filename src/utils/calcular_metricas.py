@@ -1,27 +1,10 @@
 import csv
 import json
 from pathlib import Path
+import sys
 
-
-def normalizar_nome(name):
-    letras = {
-        'á': 'a', 'à': 'a', 'ã': 'a', 'â': 'a',
-        'é': 'e', 'ê': 'e',
-        'í': 'i',
-        'ó': 'o', 'ô': 'o', 'õ': 'o',
-        'ú': 'u',
-        'ç': 'c',
-        'Á': 'A', 'À': 'A', 'Ã': 'A', 'Â': 'A',
-        'É': 'E', 'Ê': 'E',
-        'Í': 'I',
-        'Ó': 'O', 'Ô': 'O', 'Õ': 'O',
-        'Ú': 'U',
-        'Ç': 'C'
-    }
-    result = name
-    for velho, novo in letras.items():
-        result = result.replace(velho, novo)
-    return result.strip()
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from graphs.io import carregar_adjacencias, normalizar_nome
 
 
 def calcular_densidade(num_vertices, num_arestas):
@@ -31,33 +14,8 @@ def calcular_densidade(num_vertices, num_arestas):
 
 
 def carregar_csv(csv_path):
-
-    grafo = {}
-    vertices = set()
-    arestas = set()
-    
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            origem = normalizar_nome(row['bairro_origem'])
-            destino = normalizar_nome(row['bairro_destino'])
-            
-            vertices.add(origem)
-            vertices.add(destino)
-            
-            if origem not in grafo:
-                grafo[origem] = set()
-            if destino not in grafo:
-                grafo[destino] = set()
-            
-            grafo[origem].add(destino)
-            grafo[destino].add(origem)
-            
-            aresta = tuple(sorted([origem, destino]))
-            arestas.add(aresta)
-    
-    return grafo, vertices, arestas
+    dados = carregar_adjacencias(csv_path)
+    return dados.conjuntos(), dados.vertices, dados.arestas
 
 
 def calcular_grafo_completo(vertices, arestas):
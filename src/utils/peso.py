@@ -1,7 +1,11 @@
 import csv
 from pathlib import Path
+import sys
 import unicodedata
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from graphs.build_cache import default_build_cache
+
 
 def normalizar_texto(texto):
     if not isinstance(texto, str):
@@ -33,11 +37,7 @@ def atribuir_peso(logradouro):
         return ""
 
 
-def main():
-    base_path = Path(__file__).parent.parent.parent
-    arquivo_entrada = base_path / 'data' / 'Conexões - adjacencias_bairros.csv'
-    arquivo_saida = base_path / 'data' / 'adjacencias_bairros.csv'
-
+def gerar_adjacencias_com_peso(arquivo_entrada, arquivo_saida):
     with open(arquivo_entrada, mode='r', encoding='utf-8') as f_entrada:
         leitor_csv = csv.DictReader(f_entrada)
         
@@ -74,5 +74,18 @@ def main():
     print(f"Arquivo '{arquivo_saida}' criado")
 
 
+def main(force=False, cache=None):
+    base_path = Path(__file__).parent.parent.parent
+    arquivo_entrada = base_path / 'data' / 'Conexões - adjacencias_bairros.csv'
+    arquivo_saida = base_path / 'data' / 'adjacencias_bairros.csv'
+    cache = cache or default_build_cache
+
+    # As regras de peso moram neste arquivo: mudá-las também invalida o CSV gerado
+    gerado = cache.run('adjacencias_bairros', lambda: gerar_adjacencias_com_peso(arquivo_entrada, arquivo_saida),
+                       inputs=[arquivo_entrada, Path(__file__)], outputs=[arquivo_saida], force=force)
+    if not gerado:
+        print(f"Arquivo '{arquivo_saida}' sem alterações")
+
+
 if __name__ == '__main__':
     main()
@@ -1,16 +1,21 @@
-import csv
 import json
 import time
 import tracemalloc
 from pathlib import Path
 from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List, Tuple, Set
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple, Set
 import math
 import sys
 
+import numpy as np
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from graphs.algorithms import bfs, dfs, dijkstra, bellman_ford
+from graphs.algorithms import (bfs, dfs, dijkstra, spfa, astar, johnson, ReachabilityIndex,
+                               Timetable, connection_scan, pareto_paths)
+from graphs.csr import CSRGraph
+from graphs.io import ler_voos
 
 
 def calcular_distancia(lat1, lon1, lat2, lon2):
@@ -26,64 +31,128 @@ def calcular_distancia(lat1, lon1, lat2, lon2):
     
     return R * c
 
-def load_flights_data(csv_path: Path) -> Tuple[Dict, Dict]:
+def heuristica_haversine(airports: Dict, graph: Dict) -> Callable[[str, str], float]:
+    """Heurística admissível e consistente para o A* sobre o grafo de ``build_graph``.
+
+    Usa o menor peso por km observado nas arestas de ``graph``, que cobre o tempo de voo
+    (limitado pela maior velocidade média entre as rotas) e a parcela distancia/1000.
+    Como é medido sobre os pesos já arredondados, o arredondamento não quebra a garantia:
+    pela desigualdade triangular, nenhum caminho até o destino custa menos que essa taxa
+    vezes a distância em linha reta.
+    """
+    taxas = []
+    for origem, vizinhos in graph.items():
+        for destino, peso in vizinhos.items():
+            if origem in airports and destino in airports:
+                a, b = airports[origem], airports[destino]
+                distancia = calcular_distancia(a['lat'], a['lon'], b['lat'], b['lon'])
+                if distancia > 0:
+                    taxas.append(peso / distancia)
+    taxa = min(taxas, default=0.0)
+
+    def heuristica(origem: str, destino: str) -> float:
+        if origem not in airports or destino not in airports:
+            return 0.0
+        a, b = airports[origem], airports[destino]
+        return calcular_distancia(a['lat'], a['lon'], b['lat'], b['lon']) * taxa
+
+    return heuristica
+
+CHUNK_SIZE = 100_000
+
+def _primeiros_aeroportos(bloco) -> List[Tuple]:
+    """Primeira ocorrência de cada aeroporto com coordenadas, na ordem das linhas (origem antes do destino)."""
+    partes = []
+    for lado, (aeroporto, cidade, estado, lat, lon) in enumerate([
+            ('origem', 'cidade_origem', 'estado_origem', 'lat_origem', 'lon_origem'),
+            ('destino', 'cidade_destino', 'estado_destino', 'lat_destino', 'lon_destino')]):
+        parte = bloco[[aeroporto, cidade, estado, lat, lon]].dropna(subset=[lat, lon])
+        parte.columns = ['aeroporto', 'cidade', 'estado', 'lat', 'lon']
+        partes.append(parte.astype({'aeroporto': str, 'cidade': str, 'estado': str})
+                      .assign(ordem=parte.index * 2 + lado))
+    primeiros = pd.concat(partes).sort_values('ordem', kind='stable').drop_duplicates('aeroporto')
+    return list(zip(primeiros['aeroporto'], primeiros['lat'], primeiros['lon'],
+                    primeiros['cidade'], primeiros['estado']))
+
+
+def _somar_tempos(totais: Dict, bloco, chaves: List[str]):
+    grupos = bloco.groupby(chaves, observed=True, sort=False)['tempo'].agg(['sum', 'count'])
+    for chave, soma, voos in zip(grupos.index, grupos['sum'], grupos['count']):
+        total = totais.setdefault(chave, [0.0, 0])
+        total[0] += soma
+        total[1] += int(voos)
+
+
+class Trechos:
+    """Trechos realizados em colunas: ``voo``, ``origem`` e ``destino`` são índices em
+    ``voos`` e ``aeroportos``; ``partida`` e ``chegada`` em segundos desde a época."""
+
+    def __init__(self, voos: List[str], aeroportos: List[str], voo, origem, destino, partida, chegada):
+        self.voos = voos
+        self.aeroportos = aeroportos
+        self.voo = voo
+        self.origem = origem
+        self.destino = destino
+        self.partida = partida
+        self.chegada = chegada
+
+    def __len__(self) -> int:
+        return len(self.partida)
+
+
+def _codigos(coluna, indice: Dict[str, int]) -> np.ndarray:
+    """Códigos de uma coluna categórica do bloco traduzidos para o índice global ``indice``."""
+    mapa = np.array([indice.setdefault(str(nome), len(indice)) for nome in coluna.cat.categories],
+                    dtype=np.int32)
+    return mapa[coluna.cat.codes.to_numpy()]
+
+
+def load_flights_data(csv_path: Path, chunksize: int = CHUNK_SIZE) -> Tuple[Dict, Dict, Dict, Trechos]:
+    """Lê os voos em blocos colunares e já agrega as rotas, sem guardar um dict por voo.
+
+    Devolve os aeroportos, ``routes[(origem, destino)] = [soma dos tempos, voos]``, o mesmo
+    por ``(origem, destino, companhia)`` e os ``Trechos`` usados na tabela de horários.
+    """
     airports = {}
-    flights = []
-    
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                if row['Situacao.Voo'] == 'Cancelado':
-                    continue
-                
-                origem = row['Aeroporto.Origem']
-                destino = row['Aeroporto.Destino']
-                
-                if origem not in airports and row['LatOrig'] and row['LongOrig']:
-                    airports[origem] = {
-                        'lat': float(row['LatOrig']),
-                        'lon': float(row['LongOrig']),
-                        'cidade': row['Cidade.Origem'],
-                        'estado': row['Estado.Origem']
-                    }
-                
-                if destino not in airports and row['LatDest'] and row['LongDest']:
-                    airports[destino] = {
-                        'lat': float(row['LatDest']),
-                        'lon': float(row['LongDest']),
-                        'cidade': row['Cidade.Destino'],
-                        'estado': row['Estado.Destino']
-                    }
-                
-                if row['Partida.Real'] and row['Chegada.Real']:
-                    partida = datetime.fromisoformat(row['Partida.Real'].replace('Z', '+00:00'))
-                    chegada = datetime.fromisoformat(row['Chegada.Real'].replace('Z', '+00:00'))
-                    tempo_voo = (chegada - partida).total_seconds() / 3600
-                    
-                    flights.append({
-                        'origem': origem,
-                        'destino': destino,
-                        'tempo': tempo_voo,
-                        'companhia': row['Companhia.Aerea']
-                    })
-            except (KeyError, ValueError) as e:
-                continue
-    
-    return airports, flights
+    routes = {}
+    airline_routes = {}
+    voos: Dict[str, int] = {}
+    aeroportos: Dict[str, int] = {}
+    colunas = ([], [], [], [], [])
+
+    for bloco in ler_voos(csv_path, chunksize):
+        for aeroporto, lat, lon, cidade, estado in _primeiros_aeroportos(bloco):
+            if aeroporto not in airports:
+                airports[aeroporto] = {
+                    'lat': float(lat),
+                    'lon': float(lon),
+                    'cidade': cidade,
+                    'estado': estado
+                }
 
-def build_graph(airports: Dict, flights: List) -> Tuple[Dict, Dict]:
+        realizados = bloco[bloco['partida'].notna() & bloco['chegada'].notna()]
+        _somar_tempos(routes, realizados, ['origem', 'destino'])
+        _somar_tempos(airline_routes, realizados, ['origem', 'destino', 'companhia'])
+        for coluna, valores in zip(colunas, (_codigos(realizados['voo'], voos),
+                                             _codigos(realizados['origem'], aeroportos),
+                                             _codigos(realizados['destino'], aeroportos),
+                                             realizados['partida'].to_numpy(np.float64),
+                                             realizados['chegada'].to_numpy(np.float64))):
+            coluna.append(valores)
+
+    voo, origem, destino, partida, chegada = (
+        np.concatenate(coluna) if coluna else np.zeros(0, dtype)
+        for coluna, dtype in zip(colunas, (np.int32, np.int32, np.int32, np.float64, np.float64)))
+    legs = Trechos(list(voos), list(aeroportos), voo, origem, destino, partida, chegada)
+    return airports, routes, airline_routes, legs
+
+def build_graph(airports: Dict, routes: Dict) -> Tuple[Dict, Dict]:
     weighted_graph = defaultdict(lambda: {})
     unweighted_graph = defaultdict(list)
     
-    routes = defaultdict(list)
-    for flight in flights:
-        key = (flight['origem'], flight['destino'])
-        routes[key].append(flight['tempo'])
-    
-    for (origem, destino), tempos in routes.items():
+    for (origem, destino), (soma, voos) in routes.items():
         if origem in airports and destino in airports:
-            tempo_medio = sum(tempos) / len(tempos)
+            tempo_medio = soma / voos
             
             lat1, lon1 = airports[origem]['lat'], airports[origem]['lon']
             lat2, lon2 = airports[destino]['lat'], airports[destino]['lon']
@@ -97,15 +166,48 @@ def build_graph(airports: Dict, flights: List) -> Tuple[Dict, Dict]:
     return dict(weighted_graph), dict(unweighted_graph)
 
 
+def build_airline_graph(airports: Dict, airline_routes: Dict) -> Dict:
+    """Multigrafo com uma aresta por (rota, companhia), pesada pelo tempo médio de voo."""
+    airline_graph = defaultdict(list)
+    for (origem, destino, companhia), (soma, voos) in airline_routes.items():
+        if origem in airports and destino in airports:
+            airline_graph[origem].append((destino, round(soma / voos, 2), companhia))
+
+    return dict(airline_graph)
+
+
+TEMPO_MINIMO_CONEXAO = 45 * 60
+ESCALA_MAXIMA = 6 * 3600
+
+def build_timetable(legs: Trechos) -> Timetable:
+    """Tabela de conexões: trechos seguidos do mesmo voo viram uma única viagem."""
+    # Ordem por (número do voo, partida), estável como o sorted das tuplas
+    _, posicao_voo = np.unique(np.array(legs.voos, dtype=str), return_inverse=True)
+    voo = posicao_voo.reshape(-1)[legs.voo]
+    ordem = np.lexsort((legs.partida, voo))
+    voo, origem, destino = voo[ordem], legs.origem[ordem], legs.destino[ordem]
+    partida, chegada = legs.partida[ordem], legs.chegada[ordem]
+
+    # Mesmo número de voo saindo de onde o trecho anterior chegou, pouco depois: segue a bordo
+    escala = partida[1:] - chegada[:-1]
+    nova = np.ones(len(ordem), dtype=bool)
+    nova[1:] = (voo[1:] != voo[:-1]) | (origem[1:] != destino[:-1]) | \
+        ~((escala >= 0) & (escala <= ESCALA_MAXIMA))
+    viagem = np.cumsum(nova) - 1
+    return Timetable.from_columns(legs.aeroportos, origem, destino, partida, chegada, viagem)
+
+
 def run_analysis():
     base_path = Path(__file__).parent.parent.parent
     data_path = base_path / 'data' / 'dataset_parte2' / 'voos_brasil.csv'
     out_path = base_path / 'out'
     out_path.mkdir(exist_ok=True)
     
-    airports, flights = load_flights_data(data_path)
+    airports, routes, airline_routes, legs = load_flights_data(data_path)
 
-    weighted_graph, unweighted_graph = build_graph(airports, flights)
+    weighted_graph, unweighted_graph = build_graph(airports, routes)
+    weighted_csr = CSRGraph.from_dict(weighted_graph)
+    unweighted_csr = CSRGraph.from_dict(unweighted_graph)
     
     num_vertices = len(airports)
     num_edges = sum(len(neighbors) for neighbors in weighted_graph.values())
@@ -184,7 +286,7 @@ def run_analysis():
         tracemalloc.start()
         start_time = time.perf_counter()
         
-        result = bfs(unweighted_graph, source)
+        result = bfs(unweighted_csr, source)
         
         end_time = time.perf_counter()
         current, peak = tracemalloc.get_traced_memory()
@@ -209,7 +311,7 @@ def run_analysis():
         tracemalloc.start()
         start_time = time.perf_counter()
         
-        result = dfs(unweighted_graph, source)
+        result = dfs(unweighted_csr, source)
         
         end_time = time.perf_counter()
         current, peak = tracemalloc.get_traced_memory()
@@ -228,6 +330,25 @@ def run_analysis():
         }
     
 
+    tracemalloc.start()
+    start_time = time.perf_counter()
+
+    reachability = ReachabilityIndex(unweighted_csr)
+
+    end_time = time.perf_counter()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = (end_time - start_time) * 1000
+
+    tamanhos = sorted((len(c) for c in reachability.components), reverse=True)
+    report['algorithms']['scc'] = {
+        'components': len(tamanhos),
+        'largest_component': tamanhos[0] if tamanhos else 0,
+        'singleton_components': sum(1 for t in tamanhos if t == 1),
+        'condensation_edges': sum(len(d) for d in reachability.dag.values()),
+        'time_ms': round(elapsed, 3),
+        'memory_kb': round(peak / 1024, 2)
+    }
     
     dijkstra_pairs = []
     top_5_airports = [a for a, _ in top_airports[:5]]
@@ -245,7 +366,7 @@ def run_analysis():
         tracemalloc.start()
         start_time = time.perf_counter()
         
-        result = dijkstra(weighted_graph, source, target)
+        result = dijkstra(weighted_csr, source, target)
         
         end_time = time.perf_counter()
         current, peak = tracemalloc.get_traced_memory()
@@ -266,6 +387,88 @@ def run_analysis():
             'destino': f"{target} ({cidade_dest})",
             'cost': round(result['cost'], 2),
             'path_length': len(result['path_to_end']) if result['path_to_end'] else 0,
+            'reachable': reachability.reachable(source, target),
+            'time_ms': round(elapsed, 3),
+            'memory_kb': round(peak / 1024, 2)
+        }
+
+    heuristica = heuristica_haversine(airports, weighted_graph)
+
+    for source, target in dijkstra_pairs[:5]:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        result = astar(weighted_csr, source, target, heuristica)
+
+        end_time = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = (end_time - start_time) * 1000
+
+        report['algorithms'][f'astar_{source}_to_{target}'] = {
+            'origem': f"{source} ({airports[source]['cidade']})",
+            'destino': f"{target} ({airports[target]['cidade']})",
+            'cost': round(result['cost'], 2),
+            'path_length': len(result['path_to_end']) if result['path_to_end'] else 0,
+            'nodes_reached': len(result['distances']),
+            'time_ms': round(elapsed, 3),
+            'memory_kb': round(peak / 1024, 2)
+        }
+
+    timetable = build_timetable(legs)
+    inicio = float(legs.partida.min()) if len(legs) else 0.0
+
+    for source, target in dijkstra_pairs[:5]:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        result = connection_scan(timetable, source, target, inicio, TEMPO_MINIMO_CONEXAO)
+
+        end_time = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = (end_time - start_time) * 1000
+
+        chegada = result['arrival']
+        report['algorithms'][f'connection_scan_{source}_to_{target}'] = {
+            'origem': f"{source} ({airports[source]['cidade']})",
+            'destino': f"{target} ({airports[target]['cidade']})",
+            'departure_after': datetime.fromtimestamp(inicio, timezone.utc).isoformat(),
+            'arrival': datetime.fromtimestamp(chegada, timezone.utc).isoformat() if chegada != float('inf') else None,
+            'legs': len(result['legs']),
+            'path': result['path_to_end'],
+            'connections': len(timetable),
+            'time_ms': round(elapsed, 3),
+            'memory_kb': round(peak / 1024, 2)
+        }
+
+    airline_graph = build_airline_graph(airports, airline_routes)
+
+    for source, target in dijkstra_pairs[:5]:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        front = pareto_paths(airline_graph, source, target)
+
+        end_time = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = (end_time - start_time) * 1000
+
+        report['algorithms'][f'pareto_{source}_to_{target}'] = {
+            'origem': f"{source} ({airports[source]['cidade']})",
+            'destino': f"{target} ({airports[target]['cidade']})",
+            'front_size': len(front),
+            'front': [
+                {
+                    'time': round(label['time'], 2),
+                    'legs': label['legs'],
+                    'airline_changes': label['changes'],
+                    'path': label['path'],
+                    'airlines': label['airlines']
+                }
+                for label in front
+            ],
             'time_ms': round(elapsed, 3),
             'memory_kb': round(peak / 1024, 2)
         }
@@ -285,11 +488,13 @@ def run_analysis():
     
     source = top_5_airports[0]
     all_nodes = set(weighted_graph_neg.keys())
+    # Convertido uma vez: SPFA e Johnson rodam sobre o mesmo CSR
+    weighted_csr_neg = CSRGraph.from_dict(weighted_graph_neg, all_nodes)
     
     tracemalloc.start()
     start_time = time.perf_counter()
     
-    result_neg = bellman_ford(weighted_graph_neg, source, all_nodes)
+    result_neg = spfa(weighted_csr_neg, source, all_nodes)
     
     end_time = time.perf_counter()
     current, peak = tracemalloc.get_traced_memory()
@@ -303,6 +508,25 @@ def run_analysis():
         'time_ms': round(elapsed, 3),
         'memory_kb': round(peak / 1024, 2)
     }
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+
+    result_johnson = johnson(weighted_csr_neg, all_nodes)
+
+    end_time = time.perf_counter()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = (end_time - start_time) * 1000
+
+    report['algorithms']['johnson_negative_weights'] = {
+        'negative_edges': edges_negativas,
+        'has_negative_cycle': result_johnson['has_negative_cycle'],
+        'negative_cycle': result_johnson['negative_cycle'],
+        'reachable_pairs': sum(len(row) for row in result_johnson['distances'].values()),
+        'time_ms': round(elapsed, 3),
+        'memory_kb': round(peak / 1024, 2)
+    }
     
     weighted_graph_cycle = {k: v.copy() for k, v in weighted_graph.items()}
     
@@ -321,11 +545,12 @@ def run_analysis():
         weighted_graph_cycle[a3][a1] = -8.0
         
         all_nodes_cycle = set(weighted_graph_cycle.keys())
+        weighted_csr_cycle = CSRGraph.from_dict(weighted_graph_cycle, all_nodes_cycle)
         
         tracemalloc.start()
         start_time = time.perf_counter()
         
-        result_cycle = bellman_ford(weighted_graph_cycle, a1, all_nodes_cycle)
+        result_cycle = spfa(weighted_csr_cycle, a1, all_nodes_cycle)
         
         end_time = time.perf_counter()
         current, peak = tracemalloc.get_traced_memory()
@@ -1,18 +1,19 @@
 import csv
 import json
 import math
-import unicodedata
-from collections import deque
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
-from graphs.algorithms import dijkstra as dijkstra_base, bellman_ford
-from graphs.io import gerar_grafo_bairros
+from graphs.algorithms import k_shortest_paths, spfa, negative_cycle_cover, floyd_warshall
+from graphs.cache import default_cache
+from graphs.csr import CSRGraph
+from graphs.io import gerar_grafo_bairros, carregar_adjacencias, ler_voos, normalizar_nome
 
 from pyvis.network import Network
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 def criar_menu_navegacao():
@@ -216,31 +217,8 @@ def inserir_menu_em_html(html_content: str, menu_html: str) -> str:
     return html_content
 
 
-def normalizar_nome(name: str) -> str:
-    letras = {
-        'á': 'a', 'à': 'a', 'ã': 'a', 'â': 'a',
-        'é': 'e', 'ê': 'e',
-        'í': 'i',
-        'ó': 'o', 'ô': 'o', 'õ': 'o',
-        'ú': 'u',
-        'ç': 'c',
-        'Á': 'A', 'À': 'A', 'Ã': 'A', 'Â': 'A',
-        'É': 'E', 'Ê': 'E',
-        'Í': 'I',
-        'Ó': 'O', 'Ô': 'O', 'Õ': 'O',
-        'Ú': 'U',
-        'Ç': 'C'
-    }
-    result = name
-    for velho, novo in letras.items():
-        result = result.replace(velho, novo)
-    return result.strip()
-
-
 def normalizar_nome_unicode(nome: str) -> str:
-    nome_sem_acento = unicodedata.normalize('NFD', nome)
-    nome_sem_acento = ''.join(char for char in nome_sem_acento if unicodedata.category(char) != 'Mn')
-    return nome_sem_acento.strip().lower()
+    return normalizar_nome(nome).lower()
 
 
 def calcular_densidade(num_vertices: int, num_arestas: int) -> float:
@@ -249,48 +227,20 @@ def calcular_densidade(num_vertices: int, num_arestas: int) -> float:
     return (2 * num_arestas) / (num_vertices * (num_vertices - 1))
 
 
-def dijkstra_wrapper(adj: Dict[str, Dict[str, float]], src: str, dst: str) -> Tuple[float, List[str]]:
-    result = dijkstra_base(adj, src, dst)
-    if result['path_to_end'] is None:
-        return float('inf'), []
-    return result['cost'], result['path_to_end']
+def dijkstra_wrapper(grafo: CSRGraph, src: str, dst: str) -> Tuple[float, List[str]]:
+    # gerar_caminho_html e gerar_grafo_interativo_bairros partem da mesma origem:
+    # a segunda chamada reaproveita a árvore já calculada. O CSR é o mesmo objeto
+    # (carregar_adjacencias(...).csr()), então o acerto não converte nem re-hasheia o grafo
+    return default_cache.path(grafo, src, dst)
 
 
 def gerar_grafo_adjacencias(csv_path: Path) -> Dict[str, Dict[str, float]]:
-    adj: Dict[str, Dict[str, float]] = {}
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for linha in reader:
-            origem = linha.get('bairro_origem', '').strip()
-            destino = linha.get('bairro_destino', '').strip()
-            if not origem or not destino:
-                continue
-            try:
-                w = float((linha.get('peso') or '').strip() or 1.0)
-            except Exception:
-                w = 1.0
-            adj.setdefault(origem, {})[destino] = w
-            adj.setdefault(destino, {})[origem] = w
-    return adj
+    return carregar_adjacencias(csv_path).pesos()
 
 
 def carregar_adjacencias_set(csv_path: Path):
-    grafo: Dict[str, Set[str]] = {}
-    arestas = set()
-    vertices = set()
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            origem = normalizar_nome(row.get('bairro_origem', '').strip())
-            destino = normalizar_nome(row.get('bairro_destino', '').strip())
-            if not origem or not destino:
-                continue
-            vertices.add(origem)
-            vertices.add(destino)
-            grafo.setdefault(origem, set()).add(destino)
-            grafo.setdefault(destino, set()).add(origem)
-            arestas.add(tuple(sorted([origem, destino])))
-    return grafo, vertices, arestas
+    dados = carregar_adjacencias(csv_path)
+    return dados.conjuntos(), dados.vertices, dados.arestas
 
 
 def carregar_microrregiao(csv_path: Path) -> Dict[str, List[str]]:
@@ -313,11 +263,12 @@ def carregar_voos(csv_path: Path) -> Tuple[Dict[str, Dict[str, float]], Set[str]
     vertices = set()
     contagem_rotas = {}
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            origem = row.get('Aeroporto.Origem', '').strip()
-            destino = row.get('Aeroporto.Destino', '').strip()
+    # Aqui o peso é a frequência da rota no arquivo, voos cancelados incluídos
+    for bloco in ler_voos(csv_path, incluir_cancelados=True):
+        contagem = bloco.groupby(['origem', 'destino'], observed=True, sort=False).size()
+        for (origem, destino), count in contagem.items():
+            origem = origem.strip()
+            destino = destino.strip()
             
             if not origem or not destino:
                 continue
@@ -326,7 +277,7 @@ def carregar_voos(csv_path: Path) -> Tuple[Dict[str, Dict[str, float]], Set[str]
             vertices.add(destino)
             
             rota_key = (origem, destino)
-            contagem_rotas[rota_key] = contagem_rotas.get(rota_key, 0) + 1
+            contagem_rotas[rota_key] = contagem_rotas.get(rota_key, 0) + int(count)
     
     for (origem, destino), count in contagem_rotas.items():
         adj.setdefault(origem, {})[destino] = float(count)
@@ -349,7 +300,8 @@ def gerar_caminho_html(base_path: Path):
     if origem not in adj or destino not in adj:
         return
 
-    custo, caminho = dijkstra_wrapper(adj, origem, destino)
+    grafo_csr = carregar_adjacencias(csv_path).csr()
+    custo, caminho = dijkstra_wrapper(grafo_csr, origem, destino)
     if not caminho:
         return
 
@@ -366,6 +318,24 @@ def gerar_caminho_html(base_path: Path):
         peso = adj.get(origem_edge, {}).get(destino_edge, 1.0)
         net.add_edge(origem_edge, destino_edge, value=peso, title=f'peso={peso}')
 
+    # Rotas alternativas (2ª e 3ª mais curtas) em cinza tracejado sobre o percurso principal
+    no_caminho = set(caminho)
+    arestas = set(zip(caminho, caminho[1:]))
+    for ordem, alternativa in enumerate(k_shortest_paths(grafo_csr, origem, destino, k=3)):
+        if ordem == 0:
+            continue
+        for node in alternativa['path_to_end']:
+            if node not in no_caminho:
+                net.add_node(node, label=node, color='lightgray', size=15, title=node)
+                no_caminho.add(node)
+        for origem_edge, destino_edge in zip(alternativa['path_to_end'], alternativa['path_to_end'][1:]):
+            if (origem_edge, destino_edge) in arestas or (destino_edge, origem_edge) in arestas:
+                continue
+            arestas.add((origem_edge, destino_edge))
+            peso = adj.get(origem_edge, {}).get(destino_edge, 1.0)
+            net.add_edge(origem_edge, destino_edge, value=peso, color='gray', dashes=True,
+                         title=f"alternativa {ordem + 1}: custo={alternativa['cost']}")
+
     net.toggle_physics(False)
     out_html.parent.mkdir(parents=True, exist_ok=True)
     
@@ -392,7 +362,7 @@ def gerar_grafo_interativo_bairros(base_path: Path):
     path = []
     if src in adj and dst in adj:
         try:
-            cost, path = dijkstra_wrapper(adj, src, dst)
+            cost, path = dijkstra_wrapper(carregar_adjacencias(csv_adj).csr(), src, dst)
         except Exception:
             pass
 
@@ -674,32 +644,22 @@ def gerar_visualizacoes_graficos(base_path: Path):
             micror_names.append(name)
             micror_sets.append(sorted(s))
 
-    def bfs_distances(adj: Dict[str, Set[str]], src: str) -> Dict[str, int]:
-        dist = {src: 0}
-        q = deque([src])
-        while q:
-            u = q.popleft()
-            for v in adj.get(u, []):
-                if v not in dist:
-                    dist[v] = dist[u] + 1
-                    q.append(v)
-        return dist
-
     n = len(micror_names)
     if n > 0:
+        # Grafo pequeno: uma única matriz de saltos entre todos os pares (Floyd–Warshall)
+        apsp = floyd_warshall(carregar_adjacencias(csv_adj).csr_saltos())
+        posicao = {b: k for k, b in enumerate(apsp['names'])}
+        saltos = apsp['distances']
+
         matrix = [[math.nan] * n for _ in range(n)]
         for i in range(n):
+            linhas = [posicao[u] for u in micror_sets[i]]
             for j in range(n):
-                total = 0.0
-                count = 0
-                for u in micror_sets[i]:
-                    dists = bfs_distances(grafo, u)
-                    for v in micror_sets[j]:
-                        if v in dists:
-                            total += dists[v]
-                            count += 1
-                if count > 0:
-                    matrix[i][j] = total / count
+                colunas = [posicao[v] for v in micror_sets[j]]
+                bloco = saltos[np.ix_(linhas, colunas)]
+                alcancaveis = bloco[np.isfinite(bloco)]
+                if alcancaveis.size > 0:
+                    matrix[i][j] = float(alcancaveis.mean())
 
         plt.figure(figsize=(10, 8))
         im = plt.imshow(matrix, interpolation='nearest', cmap='viridis')
@@ -807,10 +767,16 @@ def gerar_caminho_bellmanford_html(base_path: Path):
     aeroportos_lista = sorted(list(aeroportos))
     origem = aeroportos_lista[0]
     
-    resultado = bellman_ford(grafo, origem, aeroportos)
+    # Convertido uma vez: SPFA e a cobertura de ciclos usam o mesmo CSR
+    grafo_csr = CSRGraph.from_dict(grafo, aeroportos)
+    resultado = spfa(grafo_csr, origem, aeroportos)
     
     if resultado['has_negative_cycle']:
         print(f"⚠️  Ciclo negativo detectado no grafo!")
+        # O SPFA só vê o que é alcançável da origem; a cobertura olha o grafo inteiro
+        cobertura = negative_cycle_cover(grafo_csr)
+        print(f"   Cobertura do grafo inteiro: {len(cobertura['cycles'])} ciclos negativos cancelados "
+              f"(remover {len(cobertura['cancelled_edges'])} arestas elimina todos; não é a contagem total)")
         if resultado['negative_cycle']:
             caminho = resultado['negative_cycle']
             titulo = f"Ciclo Negativo Detectado"
@@ -824,21 +790,7 @@ def gerar_caminho_bellmanford_html(base_path: Path):
         if len(aeroportos_alcancaveis) > 1:
             destino = max(aeroportos_alcancaveis, key=lambda a: abs(distancias[a]))
             
-            parents = {}
-            for node in aeroportos:
-                parents[node] = None
-            
-            distances_calc = {node: float('inf') for node in aeroportos}
-            distances_calc[origem] = 0.0
-            
-            for _ in range(len(aeroportos) - 1):
-                for node in grafo:
-                    if distances_calc[node] == float('inf'):
-                        continue
-                    for neighbor, weight in grafo.get(node, {}).items():
-                        if distances_calc[node] + weight < distances_calc[neighbor]:
-                            distances_calc[neighbor] = distances_calc[node] + weight
-                            parents[neighbor] = node
+            parents = resultado['parents']
             
             caminho = []
             current = destino
@@ -852,7 +804,7 @@ def gerar_caminho_bellmanford_html(base_path: Path):
             if not caminho or caminho[0] != origem:
                 caminho = [origem, destino] if destino in grafo.get(origem, {}) else [origem]
             
-            custo_total = distances_calc.get(destino, 0)
+            custo_total = distancias.get(destino, 0)
             titulo = f"Bellman-Ford: {origem.split(' - ')[0]} → {destino.split(' - ')[0]} (Custo: {custo_total:.1f})"
         else:
             caminho = [origem]
@@ -0,0 +1,46 @@
+import random
+
+
+def peso_real(rng):
+    return rng.uniform(1, 10)
+
+
+def peso_com_negativos(rng):
+    # ~20% de arestas negativas, como em voos_bellmanford.csv
+    return float(rng.randint(-80, -10) if rng.random() < 0.2 else rng.randint(5, 150))
+
+
+def grafo_aleatorio(seed, n=50, m=200, peso=None, lista=False, potenciais=False):
+    """Grafo dirigido aleatório com vértices ``v0`` ... ``v{n-1}`` e até ``m`` arestas sem laços.
+
+    Por padrão os pesos são inteiros de 1 a 9; ``peso`` recebe o ``random.Random`` e devolve
+    outro peso. Com ``lista`` o grafo sai sem pesos (``{u: [v, ...]}``). Com ``potenciais`` os
+    pesos são repesados por potenciais aleatórios: surgem pesos negativos, mas nunca ciclo negativo.
+    """
+    rng = random.Random(seed)
+    graph = {f'v{i}': ([] if lista else {}) for i in range(n)}
+    nodes = list(graph)
+    for _ in range(m):
+        a, b = rng.sample(nodes, 2)
+        if lista:
+            graph[a].append(b)
+        else:
+            graph[a][b] = peso(rng) if peso is not None else float(rng.randint(1, 9))
+
+    if potenciais:
+        p = {name: rng.randint(0, 5) for name in nodes}
+        graph = {a: {b: w + p[a] - p[b] for b, w in neighbors.items()} for a, neighbors in graph.items()}
+    return graph
+
+
+def grade(n):
+    """Grade ``n`` x ``n`` com vértices ``(x, y)`` e arestas de peso 1 entre vizinhos ortogonais."""
+    graph = {}
+    for x in range(n):
+        for y in range(n):
+            vizinhos = {}
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= x + dx < n and 0 <= y + dy < n:
+                    vizinhos[(x + dx, y + dy)] = 1.0
+            graph[(x, y)] = vizinhos
+    return graph
@@ -0,0 +1,97 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import graphs.algorithms as algorithms
+from graphs.algorithms import ALTIndex, dijkstra
+from graphs.csr import CSRGraph
+from grafos_aleatorios import grade, grafo_aleatorio
+
+
+class TestALT:
+
+    def test_custos_iguais_ao_dijkstra(self):
+        for seed in range(5):
+            graph = grafo_aleatorio(seed)
+            index = ALTIndex.build(graph, k=4)
+            rng = random.Random(seed)
+
+            for _ in range(30):
+                a, b = rng.sample(list(graph), 2)
+                esperado = dijkstra(graph, a, b)
+                result = index.query(a, b)
+
+                assert result['cost'] == esperado['cost']
+                if result['path_to_end']:
+                    path = result['path_to_end']
+                    assert sum(graph[u][v] for u, v in zip(path, path[1:])) == esperado['cost']
+
+    def test_limites_sao_admissiveis(self):
+        graph = grafo_aleatorio(9)
+        index = ALTIndex.build(graph, k=6)
+        g = index.graph
+
+        for t in range(0, len(g), 7):
+            bound = index.heuristic(t)
+            reverse = dijkstra(g.reverse(), g.names[t])['distances']
+            for name, dist in reverse.items():
+                assert bound(g.index[name]) <= dist + 1e-9
+
+    def test_landmarks_distintos(self):
+        index = ALTIndex.build(grafo_aleatorio(1), k=8)
+
+        assert len(index.landmarks) == 8
+        assert len(set(index.landmarks)) == 8
+
+    def test_salvar_e_carregar(self, tmp_path):
+        graph = grafo_aleatorio(2)
+        index = ALTIndex.build(graph, k=3)
+        arquivo = tmp_path / 'alt.json'
+
+        index.save(arquivo)
+        carregado = ALTIndex.load(arquivo, graph)
+
+        assert carregado.landmarks == index.landmarks
+        assert carregado.from_landmarks == index.from_landmarks
+        assert carregado.to_landmarks == index.to_landmarks
+
+    def test_indice_de_outra_versao_do_grafo_rejeitado(self, tmp_path):
+        graph = grafo_aleatorio(3)
+        arquivo = tmp_path / 'alt.json'
+        ALTIndex.build(graph, k=2).save(arquivo)
+
+        graph['v0']['v1'] = 100.0
+
+        with pytest.raises(ValueError):
+            ALTIndex.load(arquivo, graph)
+        assert ALTIndex.load_or_build(arquivo, graph, k=2).graph.fingerprint() == \
+            CSRGraph.from_dict(graph).fingerprint()
+
+
+    def test_consulta_local_so_guarda_estado_da_regiao_explorada(self, monkeypatch):
+        index = ALTIndex.build(CSRGraph.from_dict(grade(120)), k=4)
+        estados = []
+        original = algorithms._search_state
+
+        def registrar(n, bounded):
+            estados.append(original(n, bounded))
+            return estados[-1]
+
+        def falhar(*args):
+            raise AssertionError("uma consulta local não deveria alocar arrays de tamanho V")
+
+        monkeypatch.setattr(algorithms, '_search_state', registrar)
+        monkeypatch.setattr(algorithms, '_dense_state', falhar)
+
+        result = index.query((60, 60), (63, 64))
+
+        assert result['cost'] == 7.0
+        assert len(estados) == 1
+        assert all(len(valores) < 100 for valores in estados[0])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
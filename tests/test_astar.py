@@ -0,0 +1,118 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import astar, dijkstra
+from grafos_aleatorios import grade
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class TestAStar:
+
+    def test_caminho_simples_correto(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0, 'D': 5.0},
+            'C': {'D': 1.0},
+            'D': {}
+        }
+
+        result = astar(graph, 'A', 'D', lambda v, alvo: 0.0)
+
+        assert result['cost'] == 4.0
+        assert result['path_to_end'] == ['A', 'B', 'C', 'D']
+
+    def test_heuristica_reduz_vertices_explorados(self):
+        graph = grade(15)
+
+        com_heuristica = astar(graph, (0, 0), (14, 0), manhattan)
+        sem_heuristica = dijkstra(graph, (0, 0), (14, 0))
+
+        assert com_heuristica['cost'] == sem_heuristica['cost'] == 14.0
+        assert len(com_heuristica['distances']) < len(sem_heuristica['distances'])
+
+    def test_heuristica_admissivel_inconsistente(self):
+        graph = {
+            'S': {'A': 1.0, 'B': 1.0},
+            'A': {'C': 1.0},
+            'B': {'C': 2.0},
+            'C': {'T': 3.0},
+            'T': {}
+        }
+        h = {'S': 0.0, 'A': 4.0, 'B': 1.0, 'C': 1.0, 'T': 0.0}
+
+        result = astar(graph, 'S', 'T', lambda v, alvo: h[v])
+
+        assert result['cost'] == 5.0
+        assert result['path_to_end'] == ['S', 'A', 'C', 'T']
+
+    def test_destino_inalcancavel(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {},
+            'C': {}
+        }
+
+        result = astar(graph, 'A', 'C', lambda v, alvo: 0.0)
+
+        assert result['cost'] == float('inf')
+        assert result['path_to_end'] is None
+
+    def test_heuristica_haversine_voos(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+        from voos_analise import heuristica_haversine, calcular_distancia
+
+        airports = {
+            'REC': {'lat': -8.126, 'lon': -34.923},
+            'GRU': {'lat': -23.432, 'lon': -46.469},
+            'BSB': {'lat': -15.869, 'lon': -47.917}
+        }
+        rec_gru = calcular_distancia(-8.126, -34.923, -23.432, -46.469)
+        graph = {'REC': {'GRU': 3.5 + rec_gru / 1000}, 'GRU': {'BSB': 9.0}, 'BSB': {}}
+        h = heuristica_haversine(airports, graph)
+
+        assert h('REC', 'REC') == 0.0
+        assert h('REC', 'XXX') == 0.0
+        # A aresta REC -> GRU é a de menor peso por km: a heurística a reproduz exatamente
+        assert h('REC', 'GRU') == pytest.approx(graph['REC']['GRU'])
+        assert h('GRU', 'BSB') <= graph['GRU']['BSB']
+        assert h('REC', 'GRU') <= h('REC', 'BSB') + h('BSB', 'GRU')
+
+    def test_heuristica_haversine_poda_busca_nos_voos(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+        from voos_analise import build_graph, calcular_distancia, heuristica_haversine
+
+        rng = random.Random(3)
+        airports = {f'A{i}': {'lat': rng.uniform(-30, 0), 'lon': rng.uniform(-60, -35)} for i in range(60)}
+        routes = {}
+        for origem, a in airports.items():
+            distancias = sorted((calcular_distancia(a['lat'], a['lon'], b['lat'], b['lon']), destino)
+                                for destino, b in airports.items() if destino != origem)
+            for distancia, destino in distancias[:4]:
+                for par in ((origem, destino), (destino, origem)):
+                    # Tempo médio em horas, a velocidades de cruzeiro entre 600 e 850 km/h
+                    routes[par] = [distancia / rng.uniform(600, 850), 1]
+        graph, _ = build_graph(airports, routes)
+        h = heuristica_haversine(airports, graph)
+
+        alcancados = [0, 0]
+        for a, b in [rng.sample(list(graph), 2) for _ in range(40)]:
+            com_heuristica = astar(graph, a, b, h)
+            sem_heuristica = dijkstra(graph, a, b)
+
+            assert com_heuristica['cost'] == pytest.approx(sem_heuristica['cost'])
+            assert h(a, b) <= sem_heuristica['cost']
+            alcancados[0] += len(com_heuristica['distances'])
+            alcancados[1] += len(sem_heuristica['distances'])
+
+        assert alcancados[0] < 0.7 * alcancados[1]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -4,7 +4,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from graphs.algorithms import bfs
+from graphs.algorithms import bfs, bfs_layers, multi_source_bfs
 
 
 class TestBFS:
@@ -136,6 +136,43 @@ class TestBFS:
         assert result['distances']['F'] == 5
         assert len(result['layers']) == 6
 
+    def test_multiplas_origens_comecam_em_zero(self):
+        graph = {
+            'A': ['B'],
+            'B': ['C'],
+            'C': ['D'],
+            'D': ['E'],
+            'E': []
+        }
+
+        result = multi_source_bfs(graph, ['A', 'D'])
+
+        assert result['layers'][0] == ['A', 'D']
+        assert result['layers'][1] == ['B', 'E']
+        assert result['layers'][2] == ['C']
+        assert result['distances']['E'] == 1
+        assert result['order'] == ['A', 'D', 'B', 'E', 'C']
+
+    def test_multiplas_origens_ignora_repetidas_e_inexistentes(self):
+        graph = {
+            'A': ['B'],
+            'B': []
+        }
+
+        result = multi_source_bfs(graph, ['A', 'X', 'A'])
+
+        assert result['layers'] == {0: ['A'], 1: ['B']}
+
+    def test_gerador_de_camadas_permite_parar_cedo(self):
+        graph = {i: [i + 1] for i in range(1000)}
+        graph[1000] = []
+
+        camadas = bfs_layers(graph, [0])
+
+        assert next(camadas) == [0]
+        assert next(camadas) == [1]
+        assert next(camadas) == [2]
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
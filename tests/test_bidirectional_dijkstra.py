@@ -0,0 +1,119 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import graphs.algorithms as algorithms
+from graphs.algorithms import bidirectional_dijkstra, dijkstra
+from graphs.csr import CSRGraph
+from grafos_aleatorios import grade
+
+
+class TestBidirectionalDijkstra:
+
+    def test_caminho_simples_correto(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0, 'D': 5.0},
+            'C': {'D': 1.0},
+            'D': {}
+        }
+
+        result = bidirectional_dijkstra(graph, 'A', 'D')
+
+        assert result['cost'] == 4.0
+        assert result['path_to_end'] == ['A', 'B', 'C', 'D']
+
+    def test_grafo_dirigido_usa_arestas_reversas(self):
+        graph = {
+            'A': {'B': 10.0, 'C': 3.0},
+            'B': {'D': 2.0},
+            'C': {'B': 1.0, 'D': 8.0},
+            'D': {'A': 1.0}
+        }
+
+        result = bidirectional_dijkstra(graph, 'A', 'D')
+
+        assert result['cost'] == 6.0
+        assert result['path_to_end'] == ['A', 'C', 'B', 'D']
+
+    def test_destino_inalcancavel(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {},
+            'C': {'D': 1.0},
+            'D': {}
+        }
+
+        result = bidirectional_dijkstra(graph, 'A', 'D')
+
+        assert result['cost'] == float('inf')
+        assert result['path_to_end'] is None
+
+    def test_origem_igual_destino(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {}
+        }
+
+        result = bidirectional_dijkstra(graph, 'A', 'A')
+
+        assert result['cost'] == 0.0
+        assert result['path_to_end'] == ['A']
+
+    def test_sem_destino_igual_dijkstra(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0},
+            'C': {}
+        }
+
+        assert bidirectional_dijkstra(graph, 'A') == dijkstra(graph, 'A')
+
+    def test_custos_iguais_ao_dijkstra_em_grafos_aleatorios(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            nodes = [f'v{i}' for i in range(30)]
+            graph = {v: {} for v in nodes}
+            for _ in range(90):
+                a, b = rng.sample(nodes, 2)
+                graph[a][b] = float(rng.randint(0, 9))
+
+            for _ in range(10):
+                a, b = rng.sample(nodes, 2)
+                esperado = dijkstra(graph, a, b)
+                result = bidirectional_dijkstra(graph, a, b)
+
+                assert result['cost'] == esperado['cost']
+                if result['path_to_end']:
+                    path = result['path_to_end']
+                    assert path[0] == a and path[-1] == b
+                    assert sum(graph[u][v] for u, v in zip(path, path[1:])) == esperado['cost']
+
+
+    def test_consulta_local_so_guarda_estado_da_regiao_explorada(self, monkeypatch):
+        g = CSRGraph.from_dict(grade(200))
+        estados = []
+        original = algorithms._search_state
+
+        def registrar(n, bounded):
+            estados.append(original(n, bounded))
+            return estados[-1]
+
+        def falhar(*args):
+            raise AssertionError("uma consulta local não deveria alocar arrays de tamanho V")
+
+        monkeypatch.setattr(algorithms, '_search_state', registrar)
+        monkeypatch.setattr(algorithms, '_dense_state', falhar)
+
+        result = bidirectional_dijkstra(g, (100, 100), (100, 104))
+
+        assert result['cost'] == 4.0
+        assert len(estados) == 2
+        assert all(len(valores) < 100 for estado in estados for valores in estado)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
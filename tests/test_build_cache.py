@@ -0,0 +1,90 @@
+import pytest
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.build_cache import BuildCache
+
+
+def tocar(path, segundos=1):
+    info = os.stat(path)
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns + segundos * 10 ** 9))
+
+
+class TestBuildCache:
+
+    def preparar(self, tmp_path):
+        entrada = tmp_path / 'entrada.csv'
+        saida = tmp_path / 'saida.csv'
+        entrada.write_text('a,b\n1,2\n', encoding='utf-8')
+        chamadas = []
+
+        def gerar():
+            chamadas.append(1)
+            saida.write_text(entrada.read_text(encoding='utf-8').upper(), encoding='utf-8')
+
+        return entrada, saida, gerar, chamadas
+
+    def test_pula_quando_nada_mudou(self, tmp_path):
+        entrada, saida, gerar, chamadas = self.preparar(tmp_path)
+        cache = BuildCache(tmp_path / 'cache.json')
+
+        assert cache.run('etapa', gerar, [entrada], [saida])
+        assert not cache.run('etapa', gerar, [entrada], [saida])
+        assert not BuildCache(tmp_path / 'cache.json').run('etapa', gerar, [entrada], [saida])
+        assert len(chamadas) == 1
+
+    def test_mudanca_de_conteudo_invalida(self, tmp_path):
+        entrada, saida, gerar, chamadas = self.preparar(tmp_path)
+        cache = BuildCache(tmp_path / 'cache.json')
+        cache.run('etapa', gerar, [entrada], [saida])
+
+        # Só o mtime mudou: o hash do conteúdo continua igual
+        tocar(entrada)
+        assert not cache.run('etapa', gerar, [entrada], [saida])
+
+        entrada.write_text('a,b\n3,4\n', encoding='utf-8')
+        tocar(entrada, 2)
+        assert cache.run('etapa', gerar, [entrada], [saida])
+        assert saida.read_text(encoding='utf-8') == 'A,B\n3,4\n'
+        assert len(chamadas) == 2
+
+    def test_saida_removida_ou_editada(self, tmp_path):
+        entrada, saida, gerar, chamadas = self.preparar(tmp_path)
+        cache = BuildCache(tmp_path / 'cache.json')
+        cache.run('etapa', gerar, [entrada], [saida])
+
+        saida.unlink()
+        assert cache.run('etapa', gerar, [entrada], [saida])
+
+        saida.write_text('editado', encoding='utf-8')
+        tocar(saida)
+        assert cache.run('etapa', gerar, [entrada], [saida])
+        assert len(chamadas) == 3
+
+    def test_parametros_e_force(self, tmp_path):
+        entrada, saida, gerar, chamadas = self.preparar(tmp_path)
+        cache = BuildCache(tmp_path / 'cache.json')
+        cache.run('etapa', gerar, [entrada], [saida], params={'sep': ','})
+
+        assert not cache.run('etapa', gerar, [entrada], [saida], params={'sep': ','})
+        assert cache.run('etapa', gerar, [entrada], [saida], params={'sep': ';'})
+        assert cache.run('etapa', gerar, [entrada], [saida], params={'sep': ';'}, force=True)
+
+        cache.force = {'outra'}
+        assert not cache.run('etapa', gerar, [entrada], [saida], params={'sep': ';'})
+        cache.force = {'etapa'}
+        assert cache.run('etapa', gerar, [entrada], [saida], params={'sep': ';'})
+        assert len(chamadas) == 4
+
+    def test_registro_corrompido_refaz(self, tmp_path):
+        entrada, saida, gerar, chamadas = self.preparar(tmp_path)
+        (tmp_path / 'cache.json').write_text('{quebrado', encoding='utf-8')
+
+        assert BuildCache(tmp_path / 'cache.json').run('etapa', gerar, [entrada], [saida])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
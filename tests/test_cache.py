@@ -0,0 +1,87 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import bfs, dijkstra
+from graphs.cache import ShortestPathTreeCache
+from graphs.csr import CSRGraph
+from grafos_aleatorios import grafo_aleatorio, peso_real
+
+
+class TestShortestPathTreeCache:
+
+    def test_resultados_iguais_sem_cache(self):
+        graph = grafo_aleatorio(1, n=40, m=150, peso=peso_real)
+        cache = ShortestPathTreeCache()
+
+        for a in ['v0', 'v1', 'v2']:
+            completo = dijkstra(graph, a)
+            for b in graph:
+                esperado = dijkstra(graph, a, b)
+                result = cache.dijkstra(graph, a, b)
+                assert result['cost'] == esperado['cost']
+                assert result['path_to_end'] == esperado['path_to_end']
+                assert result['distances'] == completo['distances']
+                assert cache.path(graph, a, b) == (esperado['cost'], esperado['path_to_end'] or [])
+            assert cache.bfs(graph, a) == bfs(graph, a)
+
+        assert cache.misses == 6
+        assert cache.hits > 0
+
+    def test_chave_por_conteudo_do_grafo(self):
+        graph = grafo_aleatorio(2, n=40, m=150, peso=peso_real)
+        cache = ShortestPathTreeCache()
+
+        cache.dijkstra(graph, 'v0')
+        cache.dijkstra(CSRGraph.from_dict(grafo_aleatorio(2, n=40, m=150, peso=peso_real)), 'v0')
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        graph['v0']['v1'] = 0.5
+        assert cache.dijkstra(graph, 'v0', 'v1')['cost'] == 0.5
+        assert cache.misses == 2
+
+    def test_lru_respeita_orcamento(self):
+        graph = grafo_aleatorio(3, n=40, m=150, peso=peso_real)
+        tamanho = 40 * (8 + 4)
+        cache = ShortestPathTreeCache(max_bytes=2 * tamanho)
+
+        cache.dijkstra(graph, 'v0')
+        cache.dijkstra(graph, 'v1')
+        cache.dijkstra(graph, 'v0')
+        cache.dijkstra(graph, 'v2')
+
+        assert len(cache) == 2
+        assert cache.nbytes <= cache.max_bytes
+        cache.dijkstra(graph, 'v0')
+        assert cache.hits == 2
+        cache.dijkstra(graph, 'v1')
+        assert cache.misses == 4
+
+    def test_arvore_maior_que_orcamento_nao_e_guardada(self):
+        cache = ShortestPathTreeCache(max_bytes=16)
+
+        result = cache.dijkstra(grafo_aleatorio(4, n=40, m=150, peso=peso_real), 'v0', 'v5')
+
+        assert len(cache) == 0
+        assert result['cost'] == dijkstra(grafo_aleatorio(4, n=40, m=150, peso=peso_real), 'v0', 'v5')['cost']
+
+
+    def test_acerto_com_o_mesmo_csr_nao_converte_nem_hasheia(self, monkeypatch):
+        g = CSRGraph.from_dict(grafo_aleatorio(5, n=40, m=150, peso=peso_real))
+        cache = ShortestPathTreeCache()
+        esperado = cache.path(g, 'v0', 'v7')
+
+        def falhar(*args, **kwargs):
+            raise AssertionError("o acerto não deveria reconstruir o grafo")
+
+        monkeypatch.setattr(CSRGraph, 'from_dict', falhar)
+        monkeypatch.setattr('graphs.csr.hashlib.sha1', falhar)
+
+        assert cache.path(g, 'v0', 'v7') == esperado
+        assert cache.hits == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
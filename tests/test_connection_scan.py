@@ -0,0 +1,109 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import Timetable, connection_scan
+
+
+def tabela_aleatoria(seed, paradas=8, viagens=40):
+    rng = random.Random(seed)
+    nomes = [f's{i}' for i in range(paradas)]
+    conexoes = []
+    for v in range(viagens):
+        parada = rng.choice(nomes)
+        hora = rng.randint(0, 100)
+        for _ in range(rng.randint(1, 3)):
+            destino = rng.choice([n for n in nomes if n != parada])
+            chegada = hora + rng.randint(1, 20)
+            conexoes.append((parada, destino, float(hora), float(chegada), f'v{v}'))
+            parada, hora = destino, chegada + rng.randint(0, 5)
+    return conexoes
+
+
+def chegada_por_ponto_fixo(conexoes, start, end, t0, transfer):
+    chegada = {start: t0}
+    pronto = {start: t0}
+    a_bordo = {}
+    mudou = True
+    while mudou:
+        mudou = False
+        for i, (o, d, dep, arr, viagem) in enumerate(conexoes):
+            embarcou = a_bordo.get(viagem, float('inf')) <= dep
+            if not embarcou and pronto.get(o, float('inf')) > dep:
+                continue
+            if dep < a_bordo.get(viagem, float('inf')):
+                a_bordo[viagem] = dep
+                mudou = True
+            if arr < chegada.get(d, float('inf')):
+                chegada[d] = arr
+                pronto[d] = arr + transfer
+                mudou = True
+    return chegada.get(end, float('inf'))
+
+
+class TestConnectionScan:
+
+    def test_igual_ao_ponto_fixo(self):
+        for seed in range(20):
+            conexoes = tabela_aleatoria(seed)
+            tabela = Timetable.from_connections(conexoes)
+            rng = random.Random(seed)
+
+            for _ in range(10):
+                a, b = rng.sample(tabela.stops, 2)
+                t0 = float(rng.randint(0, 60))
+                transfer = float(rng.choice([0, 3, 10]))
+
+                result = connection_scan(tabela, a, b, t0, transfer)
+
+                assert result['arrival'] == chegada_por_ponto_fixo(conexoes, a, b, t0, transfer)
+
+    def test_trechos_da_jornada(self):
+        conexoes = tabela_aleatoria(3)
+        tabela = Timetable.from_connections(conexoes)
+
+        for a in tabela.stops:
+            for b in tabela.stops:
+                result = connection_scan(tabela, a, b, 0.0, 5.0)
+                if a == b or result['path_to_end'] is None:
+                    continue
+                legs = result['legs']
+                assert legs[0]['origem'] == a and legs[-1]['destino'] == b
+                assert legs[-1]['chegada'] == result['arrival']
+                for anterior, proximo in zip(legs, legs[1:]):
+                    assert anterior['destino'] == proximo['origem']
+                    assert anterior['chegada'] + 5.0 <= proximo['partida']
+
+    def test_tempo_minimo_de_conexao(self):
+        conexoes = [
+            ('A', 'B', 0.0, 10.0, 'v1'),
+            ('B', 'C', 12.0, 20.0, 'v2'),
+            ('B', 'C', 30.0, 40.0, 'v3'),
+            ('X', 'C', 10.0, 15.0, 'v4'),
+            ('C', 'D', 15.0, 18.0, 'v4')
+        ]
+        tabela = Timetable.from_connections(conexoes)
+
+        assert connection_scan(tabela, 'A', 'C', 0.0)['arrival'] == 20.0
+        assert connection_scan(tabela, 'A', 'C', 0.0, 5.0)['arrival'] == 40.0
+        assert connection_scan(tabela, 'A', 'C', 0.0, {'B': 1.0})['arrival'] == 20.0
+        assert connection_scan(tabela, 'A', 'C', 0.0, 5.0)['path_to_end'] == ['A', 'B', 'C']
+
+        # Seguir a bordo do mesmo voo não exige tempo de conexão
+        result = connection_scan(tabela, 'X', 'D', 0.0, 60.0)
+        assert result['arrival'] == 18.0
+        assert result['legs'] == [{'origem': 'X', 'destino': 'D', 'partida': 10.0, 'chegada': 18.0, 'viagem': 3}]
+
+    def test_sem_caminho(self):
+        tabela = Timetable.from_connections([('A', 'B', 5.0, 6.0, 'v1')])
+
+        assert connection_scan(tabela, 'A', 'B', 6.0)['arrival'] == float('inf')
+        assert connection_scan(tabela, 'B', 'A', 0.0)['path_to_end'] is None
+        assert connection_scan(tabela, 'A', 'Z', 0.0)['legs'] == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
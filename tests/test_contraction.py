@@ -0,0 +1,66 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import dijkstra
+from graphs.contraction import ContractionHierarchy
+from grafos_aleatorios import grafo_aleatorio
+
+
+class TestContractionHierarchy:
+
+    def test_custos_iguais_ao_dijkstra(self):
+        for seed in range(5):
+            graph = grafo_aleatorio(seed)
+            ch = ContractionHierarchy.build(graph)
+            rng = random.Random(seed)
+
+            for _ in range(40):
+                a, b = rng.sample(list(graph), 2)
+                esperado = dijkstra(graph, a, b)
+                result = ch.query(a, b)
+
+                assert result['cost'] == esperado['cost']
+                if result['path_to_end']:
+                    path = result['path_to_end']
+                    assert path[0] == a and path[-1] == b
+                    assert sum(graph[u][v] for u, v in zip(path, path[1:])) == esperado['cost']
+                    assert result['distances'][b] == esperado['cost']
+
+    def test_busca_de_testemunha_limitada(self):
+        graph = grafo_aleatorio(7)
+        ch = ContractionHierarchy.build(graph, witness_settled=1)
+
+        for a in list(graph)[:10]:
+            esperado = dijkstra(graph, a)['distances']
+            for b in graph:
+                assert ch.query(a, b)['cost'] == esperado.get(b, float('inf'))
+
+    def test_origem_igual_destino_e_inexistente(self):
+        ch = ContractionHierarchy.build({'A': {'B': 1.0}, 'B': {}})
+
+        assert ch.query('A', 'A')['path_to_end'] == ['A']
+        assert ch.query('B', 'A')['path_to_end'] is None
+        assert ch.query('A', 'Z')['cost'] == float('inf')
+
+    def test_salvar_e_carregar(self, tmp_path):
+        graph = grafo_aleatorio(2)
+        ch = ContractionHierarchy.build(graph)
+        arquivo = tmp_path / 'ch.json'
+
+        ch.save(arquivo)
+        carregado = ContractionHierarchy.load(arquivo, graph)
+
+        for a, b in [('v0', 'v5'), ('v3', 'v40'), ('v59', 'v1')]:
+            assert carregado.query(a, b) == ch.query(a, b)
+
+        graph['v0']['v1'] = 100.0
+        with pytest.raises(ValueError):
+            ContractionHierarchy.load(arquivo, graph)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,81 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.csr import CSRGraph
+from graphs.algorithms import bfs, dfs, dijkstra, bellman_ford
+
+
+class TestCSRGraph:
+
+    def test_conversao_grafo_ponderado(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0},
+            'C': {}
+        }
+
+        g = CSRGraph.from_dict(graph)
+
+        assert g.num_vertices == 3
+        assert g.num_edges == 3
+        assert g.names == ['A', 'B', 'C']
+        assert g.neighbors('A') == {'B': 1.0, 'C': 4.0}
+        assert g.to_dict() == graph
+
+    def test_conversao_lista_adjacencia(self):
+        graph = {
+            'A': ['C', 'B'],
+            'B': []
+        }
+
+        g = CSRGraph.from_dict(graph)
+
+        assert list(g.neighbors('A')) == ['C', 'B']
+        assert g.neighbors('A')['B'] == 1.0
+        assert 'C' in g
+        assert g.neighbors('C') == {}
+
+    def test_vertices_extras(self):
+        g = CSRGraph.from_dict({'A': {'B': 1.0}}, extra_nodes={'Z'})
+
+        assert 'Z' in g
+        assert g.num_vertices == 3
+        assert g.neighbors('Z') == {}
+
+    def test_grafo_reverso(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0},
+            'C': {'A': 3.0}
+        }
+
+        rev = CSRGraph.from_dict(graph).reverse()
+
+        assert rev.neighbors('C') == {'A': 4.0, 'B': 2.0}
+        assert rev.neighbors('A') == {'C': 3.0}
+        assert rev.reverse().to_dict() == graph
+
+    def test_offsets_invalidos(self):
+        with pytest.raises(ValueError):
+            CSRGraph(['A', 'B'], [0, 1], [1], [1.0])
+
+    def test_algoritmos_aceitam_csr(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0, 'D': 5.0},
+            'C': {'D': 1.0},
+            'D': {}
+        }
+        g = CSRGraph.from_dict(graph)
+
+        assert dijkstra(g, 'A', 'D') == dijkstra(graph, 'A', 'D')
+        assert bfs(g, 'A') == bfs(graph, 'A')
+        assert dfs(g, 'A') == dfs(graph, 'A')
+        assert bellman_ford(g, 'A', set(graph)) == bellman_ford(graph, 'A', set(graph))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
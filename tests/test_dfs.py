@@ -156,6 +156,33 @@ class TestDFS:
         assert result['has_cycle'] == False
         assert len(result['order']) == 4
 
+    def test_caminho_maior_que_limite_de_recursao(self):
+        n = sys.getrecursionlimit() * 20
+        graph = {i: [i + 1] for i in range(n)}
+        graph[n] = []
+
+        result = dfs(graph, 0)
+
+        assert len(result['order']) == n + 1
+        assert result['order'][-1] == n
+        assert result['has_cycle'] == False
+
+    def test_tempos_de_descoberta_e_termino(self):
+        graph = {
+            'A': ['B', 'C'],
+            'B': ['D'],
+            'C': [],
+            'D': []
+        }
+
+        result = dfs(graph, 'A')
+
+        assert result['discovery'] == {'A': 0, 'B': 1, 'D': 2, 'C': 5}
+        assert result['finish'] == {'D': 3, 'B': 4, 'C': 6, 'A': 7}
+        for v in result['order']:
+            assert result['discovery'][v] < result['finish'][v]
+        assert result['discovery']['A'] < result['discovery']['D'] < result['finish']['D'] < result['finish']['A']
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,106 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import graphs.algorithms as algorithms
+from graphs.algorithms import DIAL_MAX_WEIGHT, dial, dijkstra, _dial_csr, _dijkstra_csr
+from graphs.csr import CSRGraph
+
+
+class TestDial:
+
+    def test_caminho_simples_correto(self):
+        graph = {
+            'A': {'B': 1, 'C': 3},
+            'B': {'C': 1, 'D': 3},
+            'C': {'D': 1},
+            'D': {}
+        }
+
+        result = dial(graph, 'A', 'D')
+
+        assert result['cost'] == 3.0
+        assert result['path_to_end'] == ['A', 'B', 'C', 'D']
+
+    def test_pesos_zero(self):
+        graph = {
+            'A': {'B': 0, 'C': 2},
+            'B': {'D': 0},
+            'C': {'D': 1},
+            'D': {}
+        }
+
+        result = dial(graph, 'A', 'D')
+
+        assert result['cost'] == 0.0
+        assert result['path_to_end'] == ['A', 'B', 'D']
+
+    def test_pesos_fracionarios_rejeitados(self):
+        graph = {
+            'A': {'B': 0.5},
+            'B': {}
+        }
+
+        with pytest.raises(ValueError):
+            dial(graph, 'A', 'B')
+
+    def test_deteccao_pesos_inteiros(self):
+        assert CSRGraph.from_dict({'A': {'B': 3.0}, 'B': {'A': 1}}).max_integer_weight() == 3
+        assert CSRGraph.from_dict({'A': {'B': -1}}).max_integer_weight() is None
+        assert CSRGraph.from_dict({'A': {'B': float('inf')}}).max_integer_weight() is None
+        assert CSRGraph.from_dict({'A': []}).max_integer_weight() == 0
+
+    def test_igual_ao_heap_em_grafos_aleatorios(self):
+        rng = random.Random(3)
+        for _ in range(20):
+            nodes = list(range(40))
+            graph = {v: {} for v in nodes}
+            for _ in range(120):
+                a, b = rng.sample(nodes, 2)
+                graph[a][b] = rng.randint(0, 3)
+            g = CSRGraph.from_dict(graph)
+
+            for s in rng.sample(nodes, 5):
+                assert _dial_csr(g, g.index[s])[0] == _dijkstra_csr(g, g.index[s])[0]
+
+    def motores_usados(self, monkeypatch, graph, start):
+        usados = []
+        for nome in ('_dial_csr', '_dijkstra_csr'):
+            original = getattr(algorithms, nome)
+
+            def registrar(*args, _nome=nome, _original=original, **kwargs):
+                usados.append(_nome)
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(algorithms, nome, registrar)
+        result = dijkstra(graph, start)
+        monkeypatch.undo()
+        return usados, result
+
+    def test_dijkstra_escolhe_dial_automaticamente(self, monkeypatch):
+        graph = {
+            'A': {'B': 1, 'C': 2},
+            'B': {'C': 3},
+            'C': {}
+        }
+
+        for entrada in (CSRGraph.from_dict(graph), graph):
+            usados, result = self.motores_usados(monkeypatch, entrada, 'A')
+
+            assert usados == ['_dial_csr']
+            assert result['distances'] == dial(graph, 'A')['distances']
+
+    def test_dijkstra_volta_ao_heap_fora_do_alcance_do_dial(self, monkeypatch):
+        for peso in (DIAL_MAX_WEIGHT + 1, 1.5):
+            g = CSRGraph.from_dict({'A': {'B': peso, 'C': 1}, 'B': {}, 'C': {'B': 1}})
+            usados, result = self.motores_usados(monkeypatch, g, 'A')
+
+            assert usados == ['_dijkstra_csr']
+            assert result['distances'] == {'A': 0.0, 'B': min(peso, 2), 'C': 1.0}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,10 +1,13 @@
 import pytest
+import random
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from graphs.algorithms import dijkstra
+from graphs.csr import CSRGraph
+from grafos_aleatorios import grafo_aleatorio
 
 
 class TestDijkstra:
@@ -162,6 +165,103 @@ class TestDijkstra:
         
         assert result['cost'] == pytest.approx(0.3, rel=1e-9)
 
+    def test_custo_maximo_limita_busca(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 4.0},
+            'B': {'C': 2.0, 'D': 5.0},
+            'C': {'D': 1.0, 'E': 0.5},
+            'D': {},
+            'E': {}
+        }
+
+        result = dijkstra(graph, 'A', max_cost=3.0)
+
+        assert result['distances'] == {'A': 0.0, 'B': 1.0, 'C': 3.0}
+
+    def test_custo_maximo_com_pesos_inteiros(self):
+        graph = {
+            'A': {'B': 1, 'C': 3},
+            'B': {'C': 1, 'D': 3},
+            'C': {'D': 1},
+            'D': {}
+        }
+
+        assert dijkstra(graph, 'A', max_cost=2)['distances'] == {'A': 0.0, 'B': 1.0, 'C': 2.0}
+        assert dijkstra(graph, 'A', 'D', max_cost=2)['path_to_end'] is None
+
+    def test_limite_de_vertices_fixados(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 2.0, 'D': 3.0},
+            'B': {'E': 1.0},
+            'C': {'F': 1.0},
+            'D': {},
+            'E': {},
+            'F': {}
+        }
+
+        result = dijkstra(graph, 'A', max_settled=2)
+
+        assert set(result['distances']) == {'A', 'B', 'C', 'D'}
+
+    def test_limite_de_vertices_fixados_nos_extremos(self):
+        graph = {
+            'A': {'B': 1, 'C': 2},
+            'B': {'C': 1},
+            'C': {}
+        }
+
+        # Com um único vértice fixado a busca para na própria origem
+        assert dijkstra(graph, 'A', max_settled=1)['distances'] == {'A': 0.0}
+        assert dijkstra(CSRGraph.from_dict({'A': {'B': 0.5}, 'B': {}}), 'A', max_settled=1)['distances'] == {'A': 0.0}
+        for limite in (0, -1):
+            with pytest.raises(ValueError):
+                dijkstra(graph, 'A', max_settled=limite)
+
+    def test_para_quando_todos_destinos_fixados(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 3.0},
+            'B': {'D': 1.0},
+            'C': {'E': 5.0},
+            'D': {'F': 10.0},
+            'E': {},
+            'F': {}
+        }
+
+        result = dijkstra(graph, 'A', targets=['B', 'D'])
+
+        assert result['distances']['B'] == 1.0
+        assert result['distances']['D'] == 2.0
+        assert 'F' not in result['distances']
+        assert 'E' not in result['distances']
+
+    def test_destinos_com_fim_retorna_caminho(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 2.0},
+            'B': {'D': 1.0},
+            'C': {},
+            'D': {}
+        }
+
+        result = dijkstra(graph, 'A', 'D', targets=['C'])
+
+        assert result['cost'] == 2.0
+        assert result['path_to_end'] == ['A', 'B', 'D']
+        assert result['distances']['C'] == 2.0
+
+    def test_consultas_limitadas_iguais_a_busca_completa(self):
+        rng = random.Random(11)
+        for seed, pesos in enumerate(([1.0, 2.0, 3.0], [0.5, 1.5, 2.25])):
+            graph = grafo_aleatorio(seed, n=200, m=800, peso=lambda r: r.choice(pesos))
+            g = CSRGraph.from_dict(graph)
+
+            for a, b in [rng.sample(list(graph), 2) for _ in range(20)]:
+                completo = dijkstra(g, a)['distances']
+                result = dijkstra(g, a, b)
+
+                assert result['cost'] == completo.get(b, float('inf'))
+                limitado = dijkstra(g, a, max_cost=4.0)['distances']
+                assert limitado == {v: d for v, d in completo.items() if d <= 4.0}
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,61 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import bfs, direction_optimizing_bfs
+from grafos_aleatorios import grafo_aleatorio
+
+
+class TestDirectionOptimizingBFS:
+
+    def test_grafo_pequeno_niveis_corretos(self):
+        graph = {
+            'A': ['B', 'C'],
+            'B': ['D'],
+            'C': ['D', 'E'],
+            'D': ['E'],
+            'E': []
+        }
+
+        result = direction_optimizing_bfs(graph, 'A')
+
+        assert result['layers'] == {0: ['A'], 1: ['B', 'C'], 2: ['D', 'E']}
+        assert result['distances'] == {'A': 0, 'B': 1, 'C': 1, 'D': 2, 'E': 2}
+
+    def test_vertice_inexistente(self):
+        result = direction_optimizing_bfs({'A': ['B'], 'B': []}, 'C')
+
+        assert result == {'order': [], 'layers': {}, 'distances': {}}
+
+    def test_so_de_cima_para_baixo_mantem_ordem(self):
+        for seed in range(10):
+            graph = grafo_aleatorio(seed, n=60, m=240, lista=True)
+
+            result = direction_optimizing_bfs(graph, 'v0', alpha=0.0)
+
+            assert result == bfs(graph, 'v0')
+
+    def test_de_baixo_para_cima_mesmas_camadas(self):
+        for seed in range(10):
+            graph = grafo_aleatorio(seed, n=60, m=240, lista=True)
+            esperado = bfs(graph, 'v0')
+
+            result = direction_optimizing_bfs(graph, 'v0', alpha=float('inf'), beta=float('inf'))
+
+            assert result['distances'] == esperado['distances']
+            assert {k: sorted(v) for k, v in result['layers'].items()} == \
+                {k: sorted(v) for k, v in esperado['layers'].items()}
+
+    def test_alternancia_entre_direcoes(self):
+        for seed in range(10):
+            graph = grafo_aleatorio(seed, n=200, m=2000, lista=True)
+
+            result = direction_optimizing_bfs(graph, 'v0')
+
+            assert result['distances'] == bfs(graph, 'v0')['distances']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,67 @@
+import pytest
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import distance_matrix, dijkstra
+from graphs.csr import CSRGraph
+
+
+class TestDistanceMatrix:
+
+    graph = {
+        'A': {'B': 1.0, 'C': 4.0},
+        'B': {'C': 2.0, 'D': 5.0},
+        'C': {'D': 1.0},
+        'D': {},
+        'E': {'A': 0.5}
+    }
+
+    def test_matriz_origens_destinos(self):
+        matrix = distance_matrix(self.graph, ['A', 'C'], ['D', 'A'])
+
+        assert matrix.shape == (2, 2)
+        assert matrix[0, 0] == 4.0
+        assert matrix[0, 1] == 0.0
+        assert matrix[1, 0] == 1.0
+        assert matrix[1, 1] == np.inf
+
+    def test_sem_destinos_usa_todos_vertices(self):
+        g = CSRGraph.from_dict(self.graph)
+
+        matrix = distance_matrix(g, ['E'])
+
+        esperado = dijkstra(self.graph, 'E')['distances']
+        assert matrix.shape == (1, 5)
+        for j, nome in enumerate(g.names):
+            assert matrix[0, j] == esperado.get(nome, np.inf)
+
+    def test_processos_paralelos_igual_sequencial(self):
+        origens = ['A', 'B', 'C', 'D', 'E'] * 3
+
+        sequencial = distance_matrix(self.graph, origens)
+        paralelo = distance_matrix(self.graph, origens, workers=2)
+
+        assert np.array_equal(sequencial, paralelo)
+
+    def test_origens_vazias(self):
+        matrix = distance_matrix(self.graph, [], ['A', 'B'], workers=4)
+
+        assert matrix.shape == (0, 2)
+
+    def test_pickle_do_grafo_csr(self):
+        g = CSRGraph.from_dict(self.graph)
+        g.reverse()
+
+        copia = pickle.loads(pickle.dumps(g))
+
+        assert copia.to_dict() == g.to_dict()
+        assert copia._reverse is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,85 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import dijkstra
+from graphs.dynamic import DynamicSSSP
+from grafos_aleatorios import grafo_aleatorio
+
+
+def conferir(sssp, graph):
+    esperado = dijkstra(graph, sssp.source)['distances']
+    assert sssp.distances == esperado
+    for node, dist in sssp.distances.items():
+        path = sssp.path_to(node)
+        assert path[0] == sssp.source and path[-1] == node
+        assert sum(graph[u][v] for u, v in zip(path, path[1:])) == dist
+
+
+class TestDynamicSSSP:
+
+    def test_sequencia_aleatoria_de_mudancas(self):
+        for seed in range(5):
+            graph = grafo_aleatorio(seed)
+            sssp = DynamicSSSP(graph, 'v0')
+            rng = random.Random(seed)
+            nodes = list(graph)
+
+            for _ in range(60):
+                a, b = rng.sample(nodes, 2)
+                if b in graph[a] and rng.random() < 0.3:
+                    del graph[a][b]
+                    sssp.remove_edge(a, b)
+                else:
+                    graph[a][b] = float(rng.randint(1, 9))
+                    sssp.set_edge(a, b, graph[a][b])
+                conferir(sssp, graph)
+
+    def test_aumento_so_revisa_subarvore(self):
+        graph = {
+            'A': {'B': 1.0, 'D': 1.0},
+            'B': {'C': 1.0},
+            'C': {},
+            'D': {'E': 1.0},
+            'E': {}
+        }
+        sssp = DynamicSSSP(graph, 'A')
+
+        revisados = sssp.set_edge('A', 'B', 5.0)
+
+        assert revisados == {'B', 'C'}
+        assert sssp.distances['C'] == 6.0
+        assert sssp.distances['E'] == 2.0
+
+    def test_remocao_desconecta(self):
+        sssp = DynamicSSSP({'A': {'B': 1.0}, 'B': {'C': 1.0}}, 'A')
+
+        sssp.remove_edge('A', 'B')
+
+        assert sssp.distances == {'A': 0.0}
+        assert sssp.path_to('C') is None
+        assert sssp.result('C')['cost'] == float('inf')
+
+    def test_insercao_com_vertice_novo(self):
+        sssp = DynamicSSSP({'A': {'B': 2.0}}, 'A')
+
+        sssp.set_edge('B', 'Z', 1.0)
+        sssp.set_edge('A', 'Z', 1.0)
+
+        assert sssp.result('Z')['path_to_end'] == ['A', 'Z']
+        assert sssp.distances['Z'] == 1.0
+
+    def test_erros(self):
+        sssp = DynamicSSSP({'A': {'B': 1.0}}, 'A')
+
+        with pytest.raises(ValueError):
+            sssp.set_edge('A', 'B', -1.0)
+        with pytest.raises(KeyError):
+            sssp.remove_edge('B', 'A')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,68 @@
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import floyd_warshall, floyd_warshall_path, dijkstra, bellman_ford
+from grafos_aleatorios import grafo_aleatorio
+
+
+class TestFloydWarshall:
+
+    def test_distancias_iguais_ao_dijkstra(self):
+        for seed in range(3):
+            graph = grafo_aleatorio(seed, n=25, m=80)
+            result = floyd_warshall(graph)
+            names = result['names']
+
+            for i, a in enumerate(names):
+                esperado = dijkstra(graph, a)['distances']
+                for j, b in enumerate(names):
+                    assert result['distances'][i, j] == esperado.get(b, float('inf'))
+
+    def test_caminhos_pela_matriz_de_proximos(self):
+        graph = grafo_aleatorio(4, n=25, m=80)
+        result = floyd_warshall(graph)
+        names = result['names']
+
+        for i, a in enumerate(names):
+            for j, b in enumerate(names):
+                path = floyd_warshall_path(result, a, b)
+                if np.isinf(result['distances'][i, j]):
+                    assert path is None
+                else:
+                    assert path[0] == a and path[-1] == b
+                    assert sum(graph[u][v] for u, v in zip(path, path[1:])) == result['distances'][i, j]
+
+    def test_pesos_negativos_iguais_ao_bellman_ford(self):
+        graph = grafo_aleatorio(5, n=25, m=80, potenciais=True)
+        result = floyd_warshall(graph)
+        names = result['names']
+
+        assert result['has_negative_cycle'] == False
+        assert result['negative_cycle'] is None
+        for i, a in enumerate(names):
+            esperado = bellman_ford(graph, a, set(graph))['distances']
+            for j, b in enumerate(names):
+                assert result['distances'][i, j] == esperado[b]
+
+    def test_detecta_ciclo_negativo_pela_diagonal(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {'C': -3.0},
+            'C': {'A': 1.0, 'D': 2.0},
+            'D': {}
+        }
+
+        result = floyd_warshall(graph)
+
+        assert result['has_negative_cycle'] == True
+        assert set(result['negative_cycle']) == {'A', 'B', 'C'}
+        assert np.diag(result['distances'])[3] == 0.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
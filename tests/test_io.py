@@ -0,0 +1,233 @@
+import pytest
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import dijkstra, distance_matrix
+from graphs.csr import CSRGraph
+from graphs.io import carregar_adjacencias, carregar_snapshot, ler_voos, normalizar_nome, salvar_snapshot
+
+
+def escrever_csv(path, linhas):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('bairro_origem,bairro_destino,logradouro,peso\n')
+        for linha in linhas:
+            f.write(','.join(linha) + '\n')
+
+
+class TestCarregarAdjacencias:
+
+    def test_visoes(self, tmp_path):
+        arquivo = tmp_path / 'adj.csv'
+        escrever_csv(arquivo, [
+            (' Graças ', 'Derby', 'R. A', '1'),
+            ('Derby', 'Ilha do Leite', 'Av. B', '3'),
+            ('Ilha do Leite', 'Coelhos', 'X', ''),
+            ('', 'Coelhos', 'Y', '2')
+        ])
+
+        dados = carregar_adjacencias(arquivo)
+
+        assert dados.vertices == {'Gracas', 'Derby', 'Ilha do Leite', 'Coelhos'}
+        assert dados.arestas == {('Derby', 'Gracas'), ('Derby', 'Ilha do Leite'), ('Coelhos', 'Ilha do Leite')}
+        assert dados.pesos()['Derby'] == {'Gracas': 1.0, 'Ilha do Leite': 3.0}
+        assert dados.pesos()['Coelhos'] == {'Ilha do Leite': 1.0}
+        assert dados.conjuntos()['Derby'] == {'Gracas', 'Ilha do Leite'}
+        assert dados.graus() == {'Gracas': 1, 'Derby': 2, 'Ilha do Leite': 2, 'Coelhos': 1}
+        assert dados.csr().neighbors('Derby') == {'Gracas': 1.0, 'Ilha do Leite': 3.0}
+
+    def test_cache_por_processo(self, tmp_path):
+        arquivo = tmp_path / 'adj.csv'
+        escrever_csv(arquivo, [('A', 'B', 'R. A', '1')])
+
+        primeiro = carregar_adjacencias(arquivo)
+        assert carregar_adjacencias(str(arquivo)) is primeiro
+        assert primeiro.csr() is primeiro.csr()
+
+        escrever_csv(arquivo, [('A', 'B', 'R. A', '1'), ('B', 'C', 'R. B', '2')])
+        os.utime(arquivo, ns=(0, os.stat(arquivo).st_mtime_ns + 10 ** 9))
+        segundo = carregar_adjacencias(arquivo)
+
+        assert segundo is not primeiro
+        assert segundo.vertices == {'A', 'B', 'C'}
+
+    def test_normalizar_nome(self):
+        assert normalizar_nome('  Várzea ') == 'Varzea'
+        assert normalizar_nome('Ação Çà ÔÕ') == 'Acao Ca OO'
+
+
+class TestSnapshot:
+
+    GRAFO = {
+        'Várzea': {'Torre': 2.0, 'Caxanga': 1.5},
+        'Torre': {'Madalena': 1.0},
+        'Caxanga': {'Madalena': 4.0},
+        'Madalena': {}
+    }
+
+    def test_ida_e_volta(self, tmp_path):
+        arquivo = tmp_path / 'grafo.snap'
+        salvar_snapshot(arquivo, self.GRAFO,
+                        {'populacao': [10, 20, 30, 40], 'rpa': ['4', '4', '4', '4']},
+                        {'logradouro': ['a', 'b', 'c', 'b']})
+
+        snapshot = carregar_snapshot(arquivo)
+        g = snapshot.grafo
+
+        assert g.to_dict() == self.GRAFO
+        assert g.fingerprint() == CSRGraph.from_dict(self.GRAFO).fingerprint()
+        assert snapshot.vertice('populacao').tolist() == [10, 20, 30, 40]
+        assert snapshot.vertice('rpa').tolist() == ['4'] * 4
+        assert snapshot.aresta('logradouro').tolist() == ['a', 'b', 'c', 'b']
+        assert dijkstra(g, 'Várzea', 'Madalena') == dijkstra(self.GRAFO, 'Várzea', 'Madalena')
+
+        with pytest.raises(KeyError):
+            snapshot.aresta('populacao')
+
+    def test_arrays_mapeados_sem_copia(self, tmp_path):
+        arquivo = tmp_path / 'grafo.snap'
+        salvar_snapshot(arquivo, self.GRAFO, {'populacao': [1.0, 2.0, 3.0, 4.0]})
+
+        snapshot = carregar_snapshot(arquivo)
+
+        assert isinstance(snapshot.grafo.targets, memoryview)
+        assert snapshot.grafo.targets.readonly
+        assert not snapshot.vertice('populacao').flags.writeable
+
+    def test_pickle_remapeia_o_arquivo(self, tmp_path):
+        arquivo = tmp_path / 'grafo.snap'
+        salvar_snapshot(arquivo, self.GRAFO)
+        g = carregar_snapshot(arquivo).grafo
+
+        dados = pickle.dumps(g)
+        copia = pickle.loads(dados)
+
+        assert len(dados) < 200
+        assert copia.to_dict() == self.GRAFO
+        assert distance_matrix(g, ['Várzea', 'Torre'], workers=2).tolist() == \
+            distance_matrix(self.GRAFO, ['Várzea', 'Torre']).tolist()
+
+    def test_regravar_nao_afeta_mapeamento_aberto(self, tmp_path):
+        arquivo = tmp_path / 'grafo.snap'
+        salvar_snapshot(arquivo, self.GRAFO)
+        antigo = carregar_snapshot(arquivo)
+
+        salvar_snapshot(arquivo, {'A': {'B': 1.0}})
+
+        assert antigo.grafo.to_dict() == self.GRAFO
+        assert carregar_snapshot(arquivo).grafo.names == ['A', 'B']
+
+    def test_arquivo_invalido(self, tmp_path):
+        arquivo = tmp_path / 'grafo.snap'
+        arquivo.write_bytes(b'nao e snapshot')
+        with pytest.raises(ValueError):
+            carregar_snapshot(arquivo)
+
+        salvar_snapshot(arquivo, self.GRAFO)
+        dados = bytearray(arquivo.read_bytes())
+        dados[8] = 99
+        arquivo.write_bytes(bytes(dados))
+        with pytest.raises(ValueError):
+            carregar_snapshot(arquivo)
+
+    def test_atributo_com_tamanho_errado(self, tmp_path):
+        with pytest.raises(ValueError):
+            salvar_snapshot(tmp_path / 'grafo.snap', self.GRAFO, {'populacao': [1, 2]})
+
+
+CABECALHO_VOOS = ('Voos,Companhia.Aerea,Codigo.Tipo.Linha,Partida.Prevista,Partida.Real,Chegada.Prevista,'
+                  'Chegada.Real,Situacao.Voo,Codigo.Justificativa,Aeroporto.Origem,Cidade.Origem,Estado.Origem,'
+                  'Pais.Origem,Aeroporto.Destino,Cidade.Destino,Estado.Destino,Pais.Destino,LongDest,LatDest,'
+                  'LongOrig,LatOrig')
+
+
+def linha_voo(voo, origem, destino, partida, chegada, situacao='Realizado'):
+    return (f'{voo},CIA,Nacional,{partida},{partida},{chegada},{chegada},{situacao},NA,'
+            f'{origem},Cidade {origem},PE,Brasil,{destino},Cidade {destino},SP,Brasil,-46.5,-23.4,-34.9,-8.1')
+
+
+class TestLerVoos:
+
+    def escrever(self, tmp_path):
+        arquivo = tmp_path / 'voos.csv'
+        linhas = [
+            linha_voo('AAA - 1', 'Recife', 'Guarulhos', '2016-01-01T10:00:00Z', '2016-01-01T13:30:00Z'),
+            linha_voo('AAA - 2', 'Recife', 'Guarulhos', 'NA', 'NA', 'Cancelado'),
+            linha_voo('AAA - 3', 'Guarulhos', 'Recife', '2016-01-02T08:00:00Z', '2016-01-02T11:00:00Z'),
+            linha_voo('AAA - 1', 'Recife', 'Guarulhos', '2016-01-03T10:00:00Z', '2016-01-03T14:30:00Z')
+        ]
+        arquivo.write_text(CABECALHO_VOOS + '\n' + '\n'.join(linhas) + '\n', encoding='utf-8')
+        return arquivo
+
+    def test_colunas_tipadas_sem_cancelados(self, tmp_path):
+        blocos = list(ler_voos(self.escrever(tmp_path)))
+
+        assert len(blocos) == 1
+        bloco = blocos[0]
+        assert bloco.index.tolist() == [0, 2, 3]
+        assert str(bloco['origem'].dtype) == 'category'
+        assert bloco['partida'].tolist()[0] == 1451642400.0
+        assert bloco['tempo'].tolist() == [3.5, 3.0, 4.5]
+        assert bloco['lat_origem'].tolist() == [-8.1] * 3
+
+    def test_blocos_e_cancelados(self, tmp_path):
+        blocos = list(ler_voos(self.escrever(tmp_path), chunksize=3, incluir_cancelados=True))
+
+        assert [len(bloco) for bloco in blocos] == [3, 1]
+        cancelado = blocos[0].loc[1]
+        assert cancelado['situacao'] == 'Cancelado'
+        assert cancelado['partida'] != cancelado['partida']
+
+    def test_agregacao_de_rotas_por_bloco(self, tmp_path):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+        from voos_analise import build_graph, load_flights_data
+
+        arquivo = self.escrever(tmp_path)
+        airports, routes, airline_routes, legs = load_flights_data(arquivo, chunksize=1)
+
+        assert list(airports) == ['Recife', 'Guarulhos']
+        assert routes == {('Recife', 'Guarulhos'): [8.0, 2], ('Guarulhos', 'Recife'): [3.0, 1]}
+        assert airline_routes[('Recife', 'Guarulhos', 'CIA')] == [8.0, 2]
+        assert len(legs) == 3
+        assert [legs.aeroportos[i] for i in legs.origem] == ['Recife', 'Guarulhos', 'Recife']
+        assert legs.partida.dtype == np.float64 and legs.partida[0] == 1451642400.0
+
+        inteiro = load_flights_data(arquivo)
+        assert (airports, routes, airline_routes) == inteiro[:3]
+        for trechos in (legs, inteiro[3]):
+            assert [trechos.voos[i] for i in trechos.voo] == ['AAA - 1', 'AAA - 3', 'AAA - 1']
+            assert [trechos.aeroportos[i] for i in trechos.destino] == ['Guarulhos', 'Recife', 'Guarulhos']
+        assert np.array_equal(legs.chegada, inteiro[3].chegada)
+        assert build_graph(airports, routes)[1] == {'Recife': ['Guarulhos'], 'Guarulhos': ['Recife']}
+
+
+    def test_tabela_de_horarios_junta_trechos_do_mesmo_voo(self, tmp_path):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+        from voos_analise import build_timetable, load_flights_data
+
+        arquivo = tmp_path / 'voos.csv'
+        linhas = [
+            linha_voo('AAA - 1', 'Guarulhos', 'Brasilia', '2016-01-01T14:00:00Z', '2016-01-01T15:30:00Z'),
+            linha_voo('AAA - 1', 'Recife', 'Guarulhos', '2016-01-01T10:00:00Z', '2016-01-01T13:30:00Z'),
+            linha_voo('AAA - 1', 'Brasilia', 'Recife', '2016-01-02T08:00:00Z', '2016-01-02T10:00:00Z'),
+            linha_voo('BBB - 7', 'Guarulhos', 'Recife', '2016-01-01T14:00:00Z', '2016-01-01T17:00:00Z')
+        ]
+        arquivo.write_text(CABECALHO_VOOS + '\n' + '\n'.join(linhas) + '\n', encoding='utf-8')
+
+        tabela = build_timetable(load_flights_data(arquivo, chunksize=2)[3])
+
+        assert len(tabela) == 4
+        viagens = {(tabela.stops[a], tabela.stops[b]): v
+                   for a, b, v in zip(tabela.dep_stop, tabela.arr_stop, tabela.trip)}
+        # Recife -> Guarulhos -> Brasilia segue a bordo; a volta no dia seguinte é outra viagem
+        assert viagens[('Recife', 'Guarulhos')] == viagens[('Guarulhos', 'Brasilia')]
+        assert len(set(tabela.trip)) == 3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,89 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import johnson, bellman_ford, JohnsonDistances
+
+
+class TestJohnson:
+
+    def test_pesos_negativos_sem_ciclo(self):
+        graph = {
+            'A': {'B': -1.0, 'C': 4.0},
+            'B': {'C': 3.0, 'D': 2.0},
+            'C': {},
+            'D': {'C': -5.0}
+        }
+
+        result = johnson(graph)
+
+        assert result['has_negative_cycle'] == False
+        assert result['distances']['A'] == {'A': 0.0, 'B': -1.0, 'C': -4.0, 'D': 1.0}
+        assert result['distances']['D'] == {'D': 0.0, 'C': -5.0}
+        assert result['distances']['C'] == {'C': 0.0}
+
+    def test_detecta_ciclo_negativo(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {'C': 2.0},
+            'C': {'A': -5.0}
+        }
+
+        result = johnson(graph)
+
+        assert result['has_negative_cycle'] == True
+        assert sorted(result['negative_cycle']) == ['A', 'B', 'C']
+        assert result['distances'] == {}
+
+    def test_ciclo_negativo_fora_do_alcance_tambem_e_reportado(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {},
+            'C': {'D': 2.0},
+            'D': {'C': -6.0}
+        }
+
+        result = johnson(graph)
+
+        assert result['has_negative_cycle'] == True
+
+    def test_linhas_sob_demanda(self):
+        graph = {
+            'A': {'B': 2.0},
+            'B': {'C': -1.0},
+            'C': {}
+        }
+
+        result = johnson(graph, {'Z'}, lazy=True)
+        rows = result['distances']
+
+        assert isinstance(rows, JohnsonDistances)
+        assert len(rows) == 4
+        assert rows['A'] == {'A': 0.0, 'B': 2.0, 'C': 1.0}
+        assert rows['Z'] == {'Z': 0.0}
+
+    def test_igual_ao_bellman_ford_por_origem(self):
+        rng = random.Random(5)
+        for _ in range(15):
+            nodes = [f'v{i}' for i in range(15)]
+            graph = {v: {} for v in nodes}
+            # Pesos w + p(a) - p(b) com w >= 0 não formam ciclo negativo
+            potencial = {v: rng.randint(-5, 5) for v in nodes}
+            for _ in range(45):
+                a, b = rng.sample(nodes, 2)
+                graph[a][b] = float(rng.randint(0, 8) + potencial[a] - potencial[b])
+
+            result = johnson(graph)
+
+            assert result['has_negative_cycle'] == False
+            for s in nodes:
+                esperado = bellman_ford(graph, s, set(nodes))['distances']
+                alcancaveis = {v: d for v, d in esperado.items() if d != float('inf')}
+                assert result['distances'][s] == pytest.approx(alcancaveis)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
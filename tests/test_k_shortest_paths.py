@@ -0,0 +1,93 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import k_shortest_paths, dijkstra
+from grafos_aleatorios import grafo_aleatorio
+
+
+def todos_caminhos_simples(graph, start, end):
+    caminhos = []
+    stack = [(start, [start], 0.0)]
+    while stack:
+        node, path, cost = stack.pop()
+        if node == end:
+            caminhos.append((cost, path))
+            continue
+        for neighbor, weight in graph[node].items():
+            if neighbor not in path:
+                stack.append((neighbor, path + [neighbor], cost + weight))
+    return caminhos
+
+
+class TestKShortestPaths:
+
+    def test_custos_iguais_a_enumeracao(self):
+        for seed in range(10):
+            graph = grafo_aleatorio(seed, n=9, m=25, peso=lambda rng: float(rng.randint(1, 5)))
+            esperado = sorted(cost for cost, _ in todos_caminhos_simples(graph, 'v0', 'v8'))
+
+            result = list(k_shortest_paths(graph, 'v0', 'v8'))
+
+            assert [r['cost'] for r in result] == esperado
+
+    def test_caminhos_simples_e_distintos(self):
+        graph = grafo_aleatorio(3, n=9, m=25, peso=lambda rng: float(rng.randint(1, 5)))
+        result = list(k_shortest_paths(graph, 'v0', 'v8', k=10))
+
+        caminhos = [tuple(r['path_to_end']) for r in result]
+        assert len(set(caminhos)) == len(caminhos)
+        for r in result:
+            path = r['path_to_end']
+            assert path[0] == 'v0' and path[-1] == 'v8'
+            assert len(set(path)) == len(path)
+            assert sum(graph[u][v] for u, v in zip(path, path[1:])) == r['cost']
+
+    def test_primeiro_caminho_igual_ao_dijkstra(self):
+        graph = grafo_aleatorio(5, n=9, m=25, peso=lambda rng: float(rng.randint(1, 5)))
+        primeiro = next(k_shortest_paths(graph, 'v0', 'v8'))
+
+        assert primeiro['cost'] == dijkstra(graph, 'v0', 'v8')['cost']
+
+    def test_gerador_preguicoso(self):
+        graph = {
+            'A': {'B': 1.0, 'C': 2.0},
+            'B': {'D': 1.0},
+            'C': {'D': 1.0},
+            'D': {}
+        }
+
+        gen = k_shortest_paths(graph, 'A', 'D')
+        assert next(gen)['path_to_end'] == ['A', 'B', 'D']
+        assert next(gen)['path_to_end'] == ['A', 'C', 'D']
+        assert next(gen, None) is None
+
+    def test_limite_k_e_sem_caminho(self):
+        graph = grafo_aleatorio(1, n=9, m=25, peso=lambda rng: float(rng.randint(1, 5)))
+
+        assert len(list(k_shortest_paths(graph, 'v0', 'v8', k=2))) <= 2
+        assert list(k_shortest_paths(graph, 'v0', 'v8', k=0)) == []
+        assert list(k_shortest_paths({'A': {}, 'B': {}}, 'A', 'B')) == []
+        assert list(k_shortest_paths(graph, 'v0', 'Z')) == []
+
+
+    def test_rotas_alternativas_excluem_a_principal(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'src' / 'utils'))
+        from calcular_distancias import rotas_alternativas
+
+        graph = {
+            'A': {'B': 1.0, 'C': 2.0, 'D': 5.0},
+            'B': {'D': 1.0},
+            'C': {'D': 2.0},
+            'D': {}
+        }
+
+        assert rotas_alternativas(graph, 'A', 'D') == [(4.0, ['A', 'C', 'D']), (5.0, ['A', 'D'])]
+        assert rotas_alternativas(graph, 'A', 'D', k=1) == [(4.0, ['A', 'C', 'D'])]
+        assert rotas_alternativas(graph, 'A', 'D', k=5) == [(4.0, ['A', 'C', 'D']), (5.0, ['A', 'D'])]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,73 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import find_negative_cycle, negative_cycle_cover, floyd_warshall
+from grafos_aleatorios import grafo_aleatorio, peso_com_negativos
+
+
+def peso_do_ciclo(graph, cycle):
+    return sum(graph[u][v] for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+
+
+class TestNegativeCycles:
+
+    def test_deteccao_igual_ao_floyd_warshall(self):
+        encontrados = 0
+        for seed in range(30):
+            graph = grafo_aleatorio(seed, n=20, m=50, peso=peso_com_negativos)
+            cycle = find_negative_cycle(graph)
+
+            assert (cycle is not None) == floyd_warshall(graph)['has_negative_cycle']
+            if cycle:
+                encontrados += 1
+                assert len(set(cycle)) == len(cycle)
+                assert peso_do_ciclo(graph, cycle) < 0
+        assert encontrados > 0
+
+    def test_ciclo_fora_do_alcance_da_origem(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {},
+            'X': {'Y': 1.0},
+            'Y': {'Z': -2.0},
+            'Z': {'X': -1.0}
+        }
+
+        cycle = find_negative_cycle(graph)
+
+        assert set(cycle) == {'X', 'Y', 'Z'}
+        assert find_negative_cycle({'A': {'B': 1.0}, 'B': {'A': -1.0}}) is None
+        assert find_negative_cycle({'A': {'A': -1.0}}) == ['A']
+
+    def test_cobertura_por_cancelamento(self):
+        for seed in range(30):
+            graph = grafo_aleatorio(seed, n=20, m=50, peso=peso_com_negativos)
+            result = negative_cycle_cover(graph)
+
+            ciclos = [tuple(c['cycle']) for c in result['cycles']]
+            assert len(set(ciclos)) == len(ciclos)
+            for c in result['cycles']:
+                assert c['weight'] == peso_do_ciclo(graph, c['cycle']) < 0
+
+            for u, v in result['cancelled_edges']:
+                del graph[u][v]
+            assert not floyd_warshall(graph)['has_negative_cycle']
+
+    def test_varios_ciclos_disjuntos(self):
+        graph = {
+            'A': {'B': -1.0}, 'B': {'A': -1.0},
+            'C': {'D': 2.0}, 'D': {'C': -5.0},
+            'E': {'F': 1.0}, 'F': {'E': 1.0}
+        }
+
+        result = negative_cycle_cover(graph)
+
+        assert result['has_negative_cycle'] == True
+        assert sorted(sorted(c['cycle']) for c in result['cycles']) == [['A', 'B'], ['C', 'D']]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
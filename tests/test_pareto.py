@@ -0,0 +1,82 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import pareto_paths
+
+
+def multigrafo_aleatorio(seed, n=8, m=30, companhias='ABC'):
+    rng = random.Random(seed)
+    graph = {f'v{i}': [] for i in range(n)}
+    nodes = list(graph)
+    for _ in range(m):
+        a, b = rng.sample(nodes, 2)
+        graph[a].append((b, float(rng.randint(1, 9)), rng.choice(companhias)))
+    return graph
+
+
+def frente_por_enumeracao(graph, start, end):
+    vetores = set()
+    stack = [(start, [start], 0.0, 0, None)]
+    while stack:
+        node, path, time, changes, airline = stack.pop()
+        if node == end:
+            vetores.add((time, len(path) - 1, changes))
+            continue
+        for neighbor, duration, nxt in graph[node]:
+            if neighbor not in path:
+                extra = 1 if airline is not None and nxt != airline else 0
+                stack.append((neighbor, path + [neighbor], time + duration, changes + extra, nxt))
+    return {v for v in vetores
+            if not any(o != v and all(x <= y for x, y in zip(o, v)) for o in vetores)}
+
+
+class TestParetoPaths:
+
+    def test_frente_igual_a_enumeracao(self):
+        for seed in range(15):
+            graph = multigrafo_aleatorio(seed)
+
+            result = pareto_paths(graph, 'v0', 'v7')
+
+            vetores = [(r['time'], r['legs'], r['changes']) for r in result]
+            assert len(vetores) == len(set(vetores))
+            assert set(vetores) == frente_por_enumeracao(graph, 'v0', 'v7')
+
+    def test_caminhos_coerentes_com_os_criterios(self):
+        graph = multigrafo_aleatorio(4)
+
+        for r in pareto_paths(graph, 'v0', 'v7'):
+            path, airlines = r['path'], r['airlines']
+            assert path[0] == 'v0' and path[-1] == 'v7'
+            assert len(airlines) == r['legs'] == len(path) - 1
+            assert r['changes'] == sum(a != b for a, b in zip(airlines, airlines[1:]))
+
+    def test_troca_de_companhia_contra_tempo(self):
+        graph = {
+            'A': [('B', 1.0, 'X'), ('B', 2.0, 'Y')],
+            'B': [('C', 1.0, 'Y')],
+            'C': []
+        }
+
+        result = pareto_paths(graph, 'A', 'C')
+
+        assert [(r['time'], r['changes'], r['airlines']) for r in result] == [
+            (2.0, 1, ['X', 'Y']),
+            (3.0, 0, ['Y', 'Y'])
+        ]
+
+    def test_limite_de_trechos_e_casos_triviais(self):
+        graph = {'A': [('B', 1.0, 'X')], 'B': [('C', 1.0, 'X')], 'C': []}
+
+        assert pareto_paths(graph, 'A', 'C', max_legs=1) == []
+        assert pareto_paths(graph, 'A', 'A')[0]['path'] == ['A']
+        assert pareto_paths(graph, 'C', 'A') == []
+        assert pareto_paths(graph, 'Z', 'A') == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
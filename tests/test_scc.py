@@ -0,0 +1,72 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import (strongly_connected_components, condensation,
+                               ReachabilityIndex, bfs)
+from grafos_aleatorios import grafo_aleatorio
+
+
+class TestSCC:
+
+    def test_componentes_iguais_a_alcancabilidade_mutua(self):
+        for seed in range(5):
+            graph = grafo_aleatorio(seed, n=40, m=60, lista=True)
+            alcance = {v: set(bfs(graph, v)['order']) for v in graph}
+
+            components = strongly_connected_components(graph)
+
+            assert sorted(v for c in components for v in c) == sorted(graph)
+            for c in components:
+                for u in c:
+                    esperado = {v for v in graph if v in alcance[u] and u in alcance[v]}
+                    assert set(c) == esperado
+
+    def test_condensacao_em_ordem_topologica(self):
+        graph = {
+            'A': ['B'],
+            'B': ['C', 'D'],
+            'C': ['A'],
+            'D': ['E'],
+            'E': ['D']
+        }
+
+        result = condensation(graph)
+
+        assert [sorted(c) for c in result['components']] == [['A', 'B', 'C'], ['D', 'E']]
+        assert result['dag'] == {0: [1], 1: []}
+        assert result['component_of']['E'] == 1
+
+        for c, successors in condensation(grafo_aleatorio(2, n=40, m=60, lista=True))['dag'].items():
+            assert all(d > c for d in successors)
+
+    def test_caminho_longo_sem_recursao(self):
+        n = 20000
+        graph = {i: [i + 1] for i in range(n)}
+        graph[n] = [0]
+
+        components = strongly_connected_components(graph)
+
+        assert len(components) == 1
+        assert len(components[0]) == n + 1
+
+    def test_alcancabilidade_igual_a_bfs(self):
+        for seed in range(3):
+            graph = grafo_aleatorio(seed, n=40, m=60, lista=True)
+            index = ReachabilityIndex(graph)
+
+            for u in graph:
+                alcance = set(bfs(graph, u)['order'])
+                for v in graph:
+                    assert index.reachable(u, v) == (v in alcance)
+
+                componentes = {index.component_of[v] for v in alcance}
+                assert index.reachable_components(u) == sorted(componentes)
+
+        assert not ReachabilityIndex({'A': ['B']}).reachable('A', 'Z')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from graphs.algorithms import spfa, bellman_ford
+
+
+def peso_ciclo(graph, cycle):
+    return sum(graph[u][v] for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+
+
+class TestSPFA:
+
+    def test_pesos_negativos_sem_ciclo_negativo(self):
+        graph = {
+            'A': {'B': 5.0, 'C': 2.0},
+            'B': {'D': 1.0},
+            'C': {'B': -3.0, 'D': 4.0},
+            'D': {}
+        }
+
+        result = spfa(graph, 'A', set(graph))
+
+        assert result['has_negative_cycle'] == False
+        assert result['distances'] == {'A': 0.0, 'B': -1.0, 'C': 2.0, 'D': 0.0}
+
+    def test_detecta_ciclo_negativo(self):
+        graph = {
+            'A': {'B': 2.0},
+            'B': {'C': 3.0},
+            'C': {'D': 1.0},
+            'D': {'B': -8.0}
+        }
+
+        result = spfa(graph, 'A', set(graph))
+
+        assert result['has_negative_cycle'] == True
+        assert sorted(result['negative_cycle']) == ['B', 'C', 'D']
+        assert peso_ciclo(graph, result['negative_cycle']) < 0
+
+    def test_ciclo_negativo_autoloop(self):
+        graph = {
+            'A': {'A': -1.0, 'B': 1.0},
+            'B': {}
+        }
+
+        result = spfa(graph, 'A', {'A', 'B'})
+
+        assert result['has_negative_cycle'] == True
+        assert result['negative_cycle'] == ['A']
+
+    def test_ciclo_negativo_isolado(self):
+        graph = {
+            'A': {'B': 1.0},
+            'B': {},
+            'C': {'D': 2.0},
+            'D': {'E': 3.0},
+            'E': {'C': -6.0}
+        }
+
+        result = spfa(graph, 'A', set(graph))
+
+        assert result['has_negative_cycle'] == False
+        assert result['distances']['C'] == float('inf')
+
+    def test_vertice_inexistente(self):
+        result = spfa({'A': {'B': 1.0}, 'B': {}}, 'X', {'A', 'B'})
+
+        assert result['distances'] == {}
+        assert result['has_negative_cycle'] == False
+
+    def test_igual_ao_bellman_ford_em_grafos_aleatorios(self):
+        rng = random.Random(11)
+        for _ in range(30):
+            nodes = [f'v{i}' for i in range(25)]
+            graph = {v: {} for v in nodes}
+            for _ in range(60):
+                a, b = rng.sample(nodes, 2)
+                graph[a][b] = float(rng.randint(-3, 10))
+
+            esperado = bellman_ford(graph, 'v0', set(nodes))
+            result = spfa(graph, 'v0', set(nodes))
+
+            assert result['has_negative_cycle'] == esperado['has_negative_cycle']
+            if result['has_negative_cycle']:
+                assert peso_ciclo(graph, result['negative_cycle']) < 0
+            else:
+                assert result['distances'] == esperado['distances']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])